@@ -11,7 +11,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.workflow.orchestrators.workflow_orchestrator import WorkflowOrchestrator
-from src.web.frontend.app import create_app
+from src.web.frontend.app import run_server
 from src.testing.framework.test_runner import TestRunner
 
 def main():
@@ -32,8 +32,7 @@ def main():
             orchestrator.run_demo_workflow()
             
     elif args.command == "web":
-        app = create_app()
-        app.run(host="0.0.0.0", port=args.port, debug=True)
+        run_server(host="0.0.0.0", port=args.port)
         
     elif args.command == "test":
         runner = TestRunner()
@@ -4,12 +4,23 @@ Realistic Amounts Configuration
 Adjusts financial parameters to realistic construction industry values
 """
 
+import functools
 import os
+import re
+from importlib.util import find_spec
 from pathlib import Path
 
+# Importing the config stays cheap: pandas, numpy and the Excel writers are only
+# imported by the functions that write files. xlsxwriter is optional; pandas'
+# default openpyxl writer is used when it is missing.
+EXCEL_ENGINE = 'xlsxwriter' if find_spec('xlsxwriter') is not None else 'openpyxl'
+
 class RealisticAmountsConfig:
     """Configuration for realistic construction industry amounts"""
     
+    # Settings are class-level constants; instances only carry derived metadata
+    __slots__ = ('_meta',)
+    
     # Currency and formatting
     CURRENCY = "EUR"  # More internationally recognizable
     CURRENCY_SYMBOL = "€"
@@ -136,33 +147,92 @@ class RealisticAmountsConfig:
             ]
         }
     }
-
-def apply_realistic_amounts_to_file(file_path: str, project_type: str = 'office_renovation'):
-    """Apply realistic amounts to an existing agent file"""
-    
-    config = RealisticAmountsConfig()
-    project = config.DEMO_PROJECTS[project_type]
     
-    # Read the file
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Replace currency references
-    content = content.replace('RSD', config.CURRENCY)
-    content = content.replace('din', config.CURRENCY_SYMBOL)
+    def __init__(self):
+        # Derived per-project facts, computed once so callers only read fields
+        self._meta = {
+            name: {
+                'n_items': len(project['items']),
+                'estimate_fmt': f"{self.CURRENCY_SYMBOL}{project['total_estimate']:,}",
+                'items_soa': _to_soa(project['items'])
+            }
+            for name, project in self.DEMO_PROJECTS.items()
+        }
+
+# Seed for demo price variation, so generated files are reproducible
+DEMO_RANDOM_SEED = 42
+
+# Fixed price offsets (fraction of the default, within ±15%) cycled by item
+# position in generated agent code, so its output is identical on every run
+DEMO_PRICE_OFFSETS = (-0.15, 0.10, -0.05, 0.12, -0.11, 0.07, -0.08, 0.14)
+
+# Large write buffer so rewritten agent files go out in as few syscalls as possible
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Patterns used when rewriting agent files, compiled once
+_CREATE_FN_RE = re.compile(r'def create_test_excel\(\):.*?return test_file', re.DOTALL)
+_CURRENCY_RE = re.compile(r'RSD|\bdin\b')  # 'din' only as a word, not inside 'encoding'
+
+# Demo unit prices vary by ±20% around the category default
+DEMO_PRICE_VARIATION = 0.2
+
+# category -> integer id indexing the default price table
+_CATEGORY_IDS = {
+    category: index for index, category in enumerate(RealisticAmountsConfig.REALISTIC_UNIT_PRICES)
+}
+
+@functools.lru_cache(maxsize=1)
+def _default_price_table():
+    """Category default prices as a float32 array in _CATEGORY_IDS order; built on first use"""
+    import numpy as np
+    
+    return np.array(
+        [prices['default'] for prices in RealisticAmountsConfig.REALISTIC_UNIT_PRICES.values()],
+        dtype=np.float32
+    )
+
+def _to_soa(items: list) -> dict:
+    """Split a project's item dicts into per-field columns"""
+    return {
+        'categories': tuple(item['category'] for item in items),
+        'category_ids': tuple(_CATEGORY_IDS[item['category']] for item in items),
+        'descriptions': tuple(item['description'] for item in items),
+        'units': tuple(item['unit'] for item in items),
+        'quantities': tuple(item['quantity'] for item in items),
+    }
+
+# Shared instance, so the derived project metadata is computed once per process.
+# DEMO_PROJECTS stays one dict per item for readability; columns live in _meta
+CONFIG = RealisticAmountsConfig()
+
+# Currency substitutions for rewritten agent files, applied by _CURRENCY_RE in one scan
+_CURRENCY_SUBSTITUTIONS = {'RSD': CONFIG.CURRENCY, 'din': CONFIG.CURRENCY_SYMBOL}
+
+def _substitute_currency(match) -> str:
+    return _CURRENCY_SUBSTITUTIONS[match.group()]
+
+@functools.lru_cache(maxsize=None)
+def _template_for(project_type: str) -> str:
+    """Source of create_realistic_test_excel for a project type, built once per type"""
+    project = CONFIG.DEMO_PROJECTS[project_type]
+    estimate = CONFIG._meta[project_type]['estimate_fmt']
     
-    # Update demo data creation function
+    # Project data is loaded from this module at run time rather than embedded as literals
     realistic_demo_data = f'''
 def create_realistic_test_excel():
     """Create a realistic test Excel file with proper construction amounts"""
     import pandas as pd
+    from realistic_amounts_config import CONFIG as config, DEMO_PRICE_OFFSETS
+    
+    items = config.DEMO_PROJECTS[{project_type!r}]['items']
+    unit_prices_cfg = config.REALISTIC_UNIT_PRICES
     
-    # {project['name']} - Estimated Total: {config.CURRENCY_SYMBOL}{project['total_estimate']:,}
+    # {project['name']} - Estimated Total: {estimate}
     test_data = {{
-        'BR.': list(range(1, len({project['items']}) + 1)),
-        'OPIS POZICIJE': [item['description'] for item in {project['items']}],
-        'J. MERE': [item['unit'] for item in {project['items']}],
-        'KOL.': [item['quantity'] for item in {project['items']}],
+        'BR.': list(range(1, len(items) + 1)),
+        'OPIS POZICIJE': [item['description'] for item in items],
+        'J. MERE': [item['unit'] for item in items],
+        'KOL.': [item['quantity'] for item in items],
         'J. CENA': [],  # Will be calculated
         'CENA': []      # Will be calculated
     }}
@@ -170,16 +240,13 @@ def create_realistic_test_excel():
     # Calculate realistic prices
     unit_prices = []
     total_prices = []
+    # category -> default price
+    default_prices = {{category: prices['default'] for category, prices in unit_prices_cfg.items()}}
     
-    for item in {project['items']}:
-        category = item['category']
-        price_config = {config.REALISTIC_UNIT_PRICES}[category]
-        
-        # Use default price with some variation
-        base_price = price_config['default']
-        variation = base_price * 0.15  # ±15% variation
-        import random
-        unit_price = base_price + random.uniform(-variation, variation)
+    for index, item in enumerate(items):
+        # Use default price with a fixed per-position variation (±15%)
+        offset = DEMO_PRICE_OFFSETS[index % len(DEMO_PRICE_OFFSETS)]
+        unit_price = default_prices[item['category']] * (1 + offset)
         
         total_price = unit_price * item['quantity']
         
@@ -195,23 +262,50 @@ def create_realistic_test_excel():
     
     print(f"✅ Realistic test Excel file created: {{test_file}}")
     print(f"📊 Project: {project['name']}")
-    print(f"💰 Estimated Total: {config.CURRENCY_SYMBOL}{project['total_estimate']:,}")
-    print(f"📋 Items: {{len({project['items']})}} construction items")
+    print(f"💰 Estimated Total: {estimate}")
+    print(f"📋 Items: {{len(items)}} construction items")
     
     return test_file
 '''
     
+    return realistic_demo_data.strip()
+
+def apply_realistic_amounts_to_file(file_path: str, project_type: str = 'office_renovation'):
+    """Apply realistic amounts to an existing agent file"""
+    
+    config = CONFIG
+    project = config.DEMO_PROJECTS[project_type]
+    
+    # Read the file once; the untouched text doubles as the backup
+    with open(file_path, 'r', encoding='utf-8') as f:
+        original = f.read()
+    content = original
+    
+    # Already migrated files are left alone instead of being rewritten unchanged
+    has_margin_method = 'def _calculate_realistic_margin(' in original
+    needs_work = (
+        not has_margin_method
+        or 'def create_test_excel(' in original
+        or _CURRENCY_RE.search(original) is not None
+    )
+    if not needs_work:
+        print(f"⏭️ {file_path} already uses realistic amounts")
+        return
+    
+    # Replace currency references in a single scan
+    content = _CURRENCY_RE.sub(_substitute_currency, content)
+    
     # Replace the existing create_test_excel function
-    import re
-    pattern = r'def create_test_excel\(\):.*?return test_file'
-    content = re.sub(pattern, realistic_demo_data.strip(), content, flags=re.DOTALL)
+    replacement = _template_for(project_type)
+    content = _CREATE_FN_RE.sub(lambda match: replacement, content)
     
     # Update margin calculation to use realistic values
-    margin_update = f'''
+    margin_update = '''
     # Enhanced margin calculation with realistic rates
     def _calculate_realistic_margin(self, category: str, complexity: int = 3):
         """Calculate realistic margin based on category and complexity"""
-        base_margins = {config.MARGIN_RANGES}
+        from realistic_amounts_config import CONFIG
+        base_margins = CONFIG.MARGIN_RANGES
         
         if complexity <= 2:
             return base_margins['low_risk']
@@ -221,17 +315,20 @@ def create_realistic_test_excel():
             return base_margins['high_risk']
 '''
     
-    # Add the margin calculation method
-    content += margin_update
+    # Add the margin calculation method once
+    if not has_margin_method:
+        content += margin_update
     
     # Write back to file
     backup_path = file_path + '.backup'
-    if not Path(backup_path).exists():
-        # Create backup
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            f.write(open(file_path, 'r').read())
-    
-    with open(file_path, 'w', encoding='utf-8') as f:
+    try:
+        # Create backup; exclusive mode keeps an existing one without a separate stat
+        with open(backup_path, 'x', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(original)
+    except FileExistsError:
+        pass
+    
+    with open(file_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
         f.write(content)
     
     print(f"✅ Updated {file_path} with realistic amounts")
@@ -239,54 +336,76 @@ def create_realistic_test_excel():
     print(f"📈 Price range: {config.CURRENCY_SYMBOL}30 - {config.CURRENCY_SYMBOL}5,000 per unit")
     print(f"🏗️ Project type: {project['name']}")
 
-def create_realistic_demo_files():
-    """Create realistic demo files for all project types"""
+# Demo file writers by output format; xlsx is for people, csv/feather for scripts
+# (feather needs pyarrow)
+DEMO_FILE_WRITERS = {
+    'xlsx': lambda df, filename: df.to_excel(filename, index=False, engine=EXCEL_ENGINE),
+    'csv': lambda df, filename: df.to_csv(filename, index=False),
+    'feather': lambda df, filename: df.to_feather(filename),
+}
+
+def _write_demo_file(project_name: str, project_data: dict, fmt: str = 'xlsx', rng=None) -> str:
+    """Build one project's priced specification and write it; returns the filename"""
+    import pandas as pd
+    import numpy as np
+    
+    if rng is None:
+        rng = np.random.default_rng(DEMO_RANDOM_SEED)
+    
+    meta = CONFIG._meta.get(project_name)
+    columns = meta['items_soa'] if meta else _to_soa(project_data['items'])
+    
+    # Calculate realistic prices for all items at once:
+    # default price with realistic variation (±20%)
+    category_ids = np.asarray(columns['category_ids'], dtype=np.int8)
+    # Gather defaults in one step; prices are computed in float64 so cents stay exact
+    base_prices = _default_price_table()[category_ids].astype(np.float64)
+    variations = base_prices * DEMO_PRICE_VARIATION
+    quantities = np.asarray(columns['quantities'], dtype=np.float64)
+    unit_prices = base_prices + rng.uniform(-variations, variations)
+    
+    # Typed arrays throughout, so pandas adopts the columns without inferring dtypes
+    test_data = {
+        'BR.': np.arange(1, len(quantities) + 1, dtype=np.int64),
+        'OPIS POZICIJE': np.asarray(columns['descriptions'], dtype=object),
+        'J. MERE': np.asarray(columns['units'], dtype=object),
+        'KOL.': quantities,
+        'J. CENA': np.round(unit_prices, 2),
+        'CENA': np.round(unit_prices * quantities, 2)
+    }
+    
+    df = pd.DataFrame(test_data, copy=False)
+    filename = f"realistic_{project_name}_spec.{fmt}"
+    DEMO_FILE_WRITERS[fmt](df, filename)
+    return filename
+
+def create_realistic_demo_files(fmt: str = 'xlsx'):
+    """Create realistic demo files for all project types in the given format (xlsx, csv or feather)"""
+    if fmt not in DEMO_FILE_WRITERS:
+        raise ValueError(f"Unsupported demo file format: {fmt}")
     
-    config = RealisticAmountsConfig()
+    from concurrent.futures import ThreadPoolExecutor
+    import numpy as np
     
-    for project_name, project_data in config.DEMO_PROJECTS.items():
-        # Create Excel file for each project type
-        import pandas as pd
-        import random
-        
-        test_data = {
-            'BR.': list(range(1, len(project_data['items']) + 1)),
-            'OPIS POZICIJE': [item['description'] for item in project_data['items']],
-            'J. MERE': [item['unit'] for item in project_data['items']],
-            'KOL.': [item['quantity'] for item in project_data['items']],
-            'J. CENA': [],
-            'CENA': []
-        }
-        
-        # Calculate realistic prices
-        unit_prices = []
-        total_prices = []
-        
-        for item in project_data['items']:
-            category = item['category']
-            price_config = config.REALISTIC_UNIT_PRICES[category]
-            
-            # Use default price with realistic variation
-            base_price = price_config['default']
-            variation = base_price * 0.2  # ±20% variation
-            unit_price = base_price + random.uniform(-variation, variation)
-            
-            total_price = unit_price * item['quantity']
-            
-            unit_prices.append(round(unit_price, 2))
-            total_prices.append(round(total_price, 2))
-        
-        test_data['J. CENA'] = unit_prices
-        test_data['CENA'] = total_prices
-        
-        df = pd.DataFrame(test_data)
-        filename = f"realistic_{project_name}_spec.xlsx"
-        df.to_excel(filename, index=False)
-        
+    config = CONFIG
+    projects = config.DEMO_PROJECTS
+    
+    # One generator per project, spawned from the demo seed, so output is
+    # reproducible no matter which thread writes which file
+    rngs = [np.random.default_rng(seed) for seed in np.random.SeedSequence(DEMO_RANDOM_SEED).spawn(len(projects))]
+    
+    # Create a file for each project type; the writes are independent, so run them together
+    with ThreadPoolExecutor(max_workers=len(projects)) as executor:
+        filenames = list(executor.map(
+            _write_demo_file, projects.keys(), projects.values(), [fmt] * len(projects), rngs
+        ))
+    
+    for filename, (project_name, project_data) in zip(filenames, projects.items()):
+        meta = config._meta[project_name]
         print(f"✅ Created: {filename}")
         print(f"   📊 {project_data['name']}")
-        print(f"   💰 Estimated: {config.CURRENCY_SYMBOL}{project_data['total_estimate']:,}")
-        print(f"   📋 Items: {len(project_data['items'])}")
+        print(f"   💰 Estimated: {meta['estimate_fmt']}")
+        print(f"   📋 Items: {meta['n_items']}")
         print()
 
 def main():
@@ -294,7 +413,7 @@ def main():
     print("🏗️ Construction Industry Realistic Amounts Configuration")
     print("=" * 60)
     
-    config = RealisticAmountsConfig()
+    config = CONFIG
     
     print("💰 Configuration Summary:")
     print(f"   Currency: {config.CURRENCY} ({config.CURRENCY_SYMBOL})")
@@ -304,11 +423,11 @@ def main():
     
     print("🏗️ Project Templates:")
     for name, project in config.DEMO_PROJECTS.items():
-        print(f"   • {project['name']}: {config.CURRENCY_SYMBOL}{project['total_estimate']:,}")
+        print(f"   • {project['name']}: {config._meta[name]['estimate_fmt']}")
     print()
     
-    # Create realistic demo files
-    create_realistic_demo_files()
+    # Create realistic demo files; these are opened by people, so they stay xlsx
+    create_realistic_demo_files('xlsx')
     
     # Update existing agent files (if they exist in backup)
     agent_files = [
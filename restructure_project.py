@@ -4,269 +4,294 @@ Project Restructuring Tool
 Reorganizes the scattered codebase into proper domain-driven architecture
 """
 
+import errno
 import os
 import shutil
+import sys
 from pathlib import Path
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Target layout, parents before children
+NEW_DIRECTORIES = (
+    "src",
+    "src/core",
+    "src/core/models",
+    "src/core/exceptions",
+    "src/core/interfaces",
+    "src/domains",
+    "src/domains/parsing",
+    "src/domains/parsing/services",
+    "src/domains/parsing/agents",
+    "src/domains/suppliers",
+    "src/domains/suppliers/services",
+    "src/domains/suppliers/agents",
+    "src/domains/suppliers/repositories",
+    "src/domains/communication",
+    "src/domains/communication/services",
+    "src/domains/communication/agents",
+    "src/domains/responses",
+    "src/domains/responses/services",
+    "src/domains/responses/agents",
+    "src/domains/quotes",
+    "src/domains/quotes/services",
+    "src/domains/quotes/agents",
+    "src/domains/documents",
+    "src/domains/documents/services",
+    "src/domains/documents/agents",
+    "src/workflow",
+    "src/workflow/orchestrators",
+    "src/workflow/builders",
+    "src/infrastructure",
+    "src/infrastructure/config",
+    "src/infrastructure/persistence",
+    "src/infrastructure/external",
+    "src/web",
+    "src/web/api",
+    "src/web/api/routes",
+    "src/web/api/middleware",
+    "src/web/frontend",
+    "src/web/frontend/templates",
+    "src/web/frontend/static",
+    "src/web/frontend/static/css",
+    "src/web/frontend/static/js",
+    "src/web/frontend/static/images",
+    "src/testing",
+    "src/testing/framework",
+    "src/testing/fixtures",
+    "tests",
+    "tests/unit",
+    "tests/unit/domains",
+    "tests/unit/workflow",
+    "tests/integration",
+    "tests/e2e",
+    "tests/fixtures",
+    "tests/fixtures/excel_files",
+    "tests/fixtures/mock_responses",
+    "tests/fixtures/expected_outputs",
+    "docs",
+    "docs/api",
+    "docs/architecture",
+    "docs/user_guides",
+    "docs/deployment",
+    "scripts",
+    "config",
+)
+
+# Placeholder modules created empty in the target layout
+NEW_FILES = (
+    "src/core/__init__.py",
+    "src/core/models/__init__.py",
+    "src/core/models/construction_item.py",
+    "src/core/models/supplier.py",
+    "src/core/models/quote.py",
+    "src/core/models/workflow.py",
+    "src/core/exceptions/__init__.py",
+    "src/core/exceptions/base.py",
+    "src/core/exceptions/parsing.py",
+    "src/core/exceptions/workflow.py",
+    "src/core/interfaces/__init__.py",
+    "src/core/interfaces/agent_interface.py",
+    "src/core/interfaces/parser_interface.py",
+    "src/core/interfaces/communicator_interface.py",
+    "src/core/interfaces/generator_interface.py",
+    "src/domains/__init__.py",
+    "src/domains/parsing/__init__.py",
+    "src/domains/parsing/services/__init__.py",
+    "src/domains/parsing/services/excel_parser_service.py",
+    "src/domains/parsing/services/document_analyzer_service.py",
+    "src/domains/parsing/agents/__init__.py",
+    "src/domains/parsing/agents/excel_parser_agent.py",
+    "src/domains/suppliers/__init__.py",
+    "src/domains/suppliers/services/__init__.py",
+    "src/domains/suppliers/services/supplier_mapping_service.py",
+    "src/domains/suppliers/services/supplier_database_service.py",
+    "src/domains/suppliers/agents/__init__.py",
+    "src/domains/suppliers/agents/supplier_mapping_agent.py",
+    "src/domains/suppliers/repositories/__init__.py",
+    "src/domains/suppliers/repositories/supplier_repository.py",
+    "src/domains/communication/__init__.py",
+    "src/domains/communication/services/__init__.py",
+    "src/domains/communication/services/email_service.py",
+    "src/domains/communication/services/api_service.py",
+    "src/domains/communication/services/communication_service.py",
+    "src/domains/communication/agents/__init__.py",
+    "src/domains/communication/agents/communication_agent.py",
+    "src/domains/responses/__init__.py",
+    "src/domains/responses/services/__init__.py",
+    "src/domains/responses/services/response_parser_service.py",
+    "src/domains/responses/services/ocr_service.py",
+    "src/domains/responses/services/price_extraction_service.py",
+    "src/domains/responses/agents/__init__.py",
+    "src/domains/responses/agents/response_parser_agent.py",
+    "src/domains/quotes/__init__.py",
+    "src/domains/quotes/services/__init__.py",
+    "src/domains/quotes/services/quote_calculation_service.py",
+    "src/domains/quotes/services/pricing_optimization_service.py",
+    "src/domains/quotes/agents/__init__.py",
+    "src/domains/quotes/agents/quote_calculator_agent.py",
+    "src/domains/documents/__init__.py",
+    "src/domains/documents/services/__init__.py",
+    "src/domains/documents/services/document_generation_service.py",
+    "src/domains/documents/services/template_service.py",
+    "src/domains/documents/services/export_service.py",
+    "src/domains/documents/agents/__init__.py",
+    "src/domains/documents/agents/document_generator_agent.py",
+    "src/workflow/__init__.py",
+    "src/workflow/orchestrators/__init__.py",
+    "src/workflow/orchestrators/workflow_orchestrator.py",
+    "src/workflow/orchestrators/visual_workflow_orchestrator.py",
+    "src/workflow/orchestrators/web_workflow_orchestrator.py",
+    "src/workflow/builders/__init__.py",
+    "src/workflow/builders/system_builder.py",
+    "src/workflow/builders/diagram_parser.py",
+    "src/infrastructure/__init__.py",
+    "src/infrastructure/config/__init__.py",
+    "src/infrastructure/config/settings.py",
+    "src/infrastructure/config/logging_config.py",
+    "src/infrastructure/persistence/__init__.py",
+    "src/infrastructure/persistence/file_storage.py",
+    "src/infrastructure/persistence/session_storage.py",
+    "src/infrastructure/external/__init__.py",
+    "src/infrastructure/external/openai_client.py",
+    "src/infrastructure/external/email_client.py",
+    "src/web/__init__.py",
+    "src/web/api/__init__.py",
+    "src/web/api/routes/__init__.py",
+    "src/web/api/routes/demo_routes.py",
+    "src/web/api/routes/workflow_routes.py",
+    "src/web/api/routes/health_routes.py",
+    "src/web/api/middleware/__init__.py",
+    "src/web/api/middleware/cors_middleware.py",
+    "src/web/api/middleware/error_middleware.py",
+    "src/web/frontend/__init__.py",
+    "src/web/frontend/app.py",
+    "src/testing/__init__.py",
+    "src/testing/framework/__init__.py",
+    "src/testing/framework/test_runner.py",
+    "src/testing/framework/visual_test_runner.py",
+    "src/testing/framework/performance_tester.py",
+    "src/testing/fixtures/__init__.py",
+    "src/testing/fixtures/excel_fixtures.py",
+    "src/testing/fixtures/supplier_fixtures.py",
+    "tests/__init__.py",
+    "tests/unit/__init__.py",
+    "tests/unit/domains/__init__.py",
+    "tests/unit/domains/test_parsing.py",
+    "tests/unit/domains/test_suppliers.py",
+    "tests/unit/domains/test_communication.py",
+    "tests/unit/domains/test_responses.py",
+    "tests/unit/domains/test_quotes.py",
+    "tests/unit/domains/test_documents.py",
+    "tests/unit/workflow/__init__.py",
+    "tests/unit/workflow/test_orchestrator.py",
+    "tests/unit/workflow/test_builder.py",
+    "tests/integration/__init__.py",
+    "tests/integration/test_full_workflow.py",
+    "tests/integration/test_web_api.py",
+    "tests/e2e/__init__.py",
+    "tests/e2e/test_complete_system.py",
+    "scripts/setup.py",
+    "scripts/deploy.py",
+    "scripts/migration.py",
+    "config/development.py",
+    "config/production.py",
+    "config/testing.py",
+)
+
+def _write_if_changed(path, content: bytes) -> bool:
+    """Write content unless the file already holds exactly these bytes"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return False
+            shared = os.fstat(f.fileno()).st_nlink > 1
+        # Never write through a hardlink shared with the backup snapshot
+        if shared:
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+    
+    # Payloads are small, so a single unbuffered write is enough
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content)
+    finally:
+        os.close(fd)
+    return True
+
+# Binary assets nothing in the project rewrites. Only these are hardlinked
+# into the backup: sources, docs and generated outputs are edited in place
+# (fix_imports, realistic_amounts_config, workflow runs), and writing through
+# a shared inode would change the backup too.
+SNAPSHOT_LINK_SUFFIXES = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.ico', '.pdf',
+    '.woff', '.woff2', '.ttf', '.zip', '.gz'
+})
+
+def _snapshot_file(src, dst):
+    """Back up one file, hardlinking immutable assets on the same device and copying the rest"""
+    if os.path.splitext(src)[1].lower() in SNAPSHOT_LINK_SUFFIXES:
+        if os.stat(src).st_dev == os.stat(os.path.dirname(dst)).st_dev:
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                pass
+    shutil.copy2(src, dst)
+
+def _parallel_copytree(src, dst, ignore=None, workers=None, copy_function=shutil.copy2):
+    """Copy a directory tree, mirroring directories first and copying files on a thread pool"""
+    files = []
+    pending = [(src, dst)]
+    while pending:
+        src_dir, dst_dir = pending.pop()
+        os.makedirs(dst_dir, exist_ok=True)
+        with os.scandir(src_dir) as it:
+            entries = list(it)
+        ignored = ignore(src_dir, [e.name for e in entries]) if ignore else ()
+        for entry in entries:
+            if entry.name in ignored:
+                continue
+            target = os.path.join(dst_dir, entry.name)
+            if entry.is_symlink():
+                os.symlink(os.readlink(entry.path), target)
+            elif entry.is_dir(follow_symlinks=False):
+                pending.append((entry.path, target))
+            else:
+                files.append((entry.path, target))
+    
+    # Directories all exist by now, so copy tasks never race on mkdir
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(copy_function, s, d) for s, d in files]:
+            future.result()
+
 class ProjectRestructurer:
     """Restructures the project into proper domain architecture"""
     
     def __init__(self):
         self.root_path = Path(".")
-        self.new_structure = {
-            "src": {
-                "core": {
-                    "__init__.py": "",
-                    "models": {
-                        "__init__.py": "",
-                        "construction_item.py": "",
-                        "supplier.py": "",
-                        "quote.py": "",
-                        "workflow.py": ""
-                    },
-                    "exceptions": {
-                        "__init__.py": "",
-                        "base.py": "",
-                        "parsing.py": "",
-                        "workflow.py": ""
-                    },
-                    "interfaces": {
-                        "__init__.py": "",
-                        "agent_interface.py": "",
-                        "parser_interface.py": "",
-                        "communicator_interface.py": "",
-                        "generator_interface.py": ""
-                    }
-                },
-                "domains": {
-                    "__init__.py": "",
-                    "parsing": {
-                        "__init__.py": "",
-                        "services": {
-                            "__init__.py": "",
-                            "excel_parser_service.py": "",
-                            "document_analyzer_service.py": ""
-                        },
-                        "agents": {
-                            "__init__.py": "",
-                            "excel_parser_agent.py": ""
-                        }
-                    },
-                    "suppliers": {
-                        "__init__.py": "",
-                        "services": {
-                            "__init__.py": "",
-                            "supplier_mapping_service.py": "",
-                            "supplier_database_service.py": ""
-                        },
-                        "agents": {
-                            "__init__.py": "",
-                            "supplier_mapping_agent.py": ""
-                        },
-                        "repositories": {
-                            "__init__.py": "",
-                            "supplier_repository.py": ""
-                        }
-                    },
-                    "communication": {
-                        "__init__.py": "",
-                        "services": {
-                            "__init__.py": "",
-                            "email_service.py": "",
-                            "api_service.py": "",
-                            "communication_service.py": ""
-                        },
-                        "agents": {
-                            "__init__.py": "",
-                            "communication_agent.py": ""
-                        }
-                    },
-                    "responses": {
-                        "__init__.py": "",
-                        "services": {
-                            "__init__.py": "",
-                            "response_parser_service.py": "",
-                            "ocr_service.py": "",
-                            "price_extraction_service.py": ""
-                        },
-                        "agents": {
-                            "__init__.py": "",
-                            "response_parser_agent.py": ""
-                        }
-                    },
-                    "quotes": {
-                        "__init__.py": "",
-                        "services": {
-                            "__init__.py": "",
-                            "quote_calculation_service.py": "",
-                            "pricing_optimization_service.py": ""
-                        },
-                        "agents": {
-                            "__init__.py": "",
-                            "quote_calculator_agent.py": ""
-                        }
-                    },
-                    "documents": {
-                        "__init__.py": "",
-                        "services": {
-                            "__init__.py": "",
-                            "document_generation_service.py": "",
-                            "template_service.py": "",
-                            "export_service.py": ""
-                        },
-                        "agents": {
-                            "__init__.py": "",
-                            "document_generator_agent.py": ""
-                        }
-                    }
-                },
-                "workflow": {
-                    "__init__.py": "",
-                    "orchestrators": {
-                        "__init__.py": "",
-                        "workflow_orchestrator.py": "",
-                        "visual_workflow_orchestrator.py": "",
-                        "web_workflow_orchestrator.py": ""
-                    },
-                    "builders": {
-                        "__init__.py": "",
-                        "system_builder.py": "",
-                        "diagram_parser.py": ""
-                    }
-                },
-                "infrastructure": {
-                    "__init__.py": "",
-                    "config": {
-                        "__init__.py": "",
-                        "settings.py": "",
-                        "logging_config.py": ""
-                    },
-                    "persistence": {
-                        "__init__.py": "",
-                        "file_storage.py": "",
-                        "session_storage.py": ""
-                    },
-                    "external": {
-                        "__init__.py": "",
-                        "openai_client.py": "",
-                        "email_client.py": ""
-                    }
-                },
-                "web": {
-                    "__init__.py": "",
-                    "api": {
-                        "__init__.py": "",
-                        "routes": {
-                            "__init__.py": "",
-                            "demo_routes.py": "",
-                            "workflow_routes.py": "",
-                            "health_routes.py": ""
-                        },
-                        "middleware": {
-                            "__init__.py": "",
-                            "cors_middleware.py": "",
-                            "error_middleware.py": ""
-                        }
-                    },
-                    "frontend": {
-                        "__init__.py": "",
-                        "app.py": "",
-                        "templates": {},
-                        "static": {
-                            "css": {},
-                            "js": {},
-                            "images": {}
-                        }
-                    }
-                },
-                "testing": {
-                    "__init__.py": "",
-                    "framework": {
-                        "__init__.py": "",
-                        "test_runner.py": "",
-                        "visual_test_runner.py": "",
-                        "performance_tester.py": ""
-                    },
-                    "fixtures": {
-                        "__init__.py": "",
-                        "excel_fixtures.py": "",
-                        "supplier_fixtures.py": ""
-                    }
-                }
-            },
-            "tests": {
-                "__init__.py": "",
-                "unit": {
-                    "__init__.py": "",
-                    "domains": {
-                        "__init__.py": "",
-                        "test_parsing.py": "",
-                        "test_suppliers.py": "",
-                        "test_communication.py": "",
-                        "test_responses.py": "",
-                        "test_quotes.py": "",
-                        "test_documents.py": ""
-                    },
-                    "workflow": {
-                        "__init__.py": "",
-                        "test_orchestrator.py": "",
-                        "test_builder.py": ""
-                    }
-                },
-                "integration": {
-                    "__init__.py": "",
-                    "test_full_workflow.py": "",
-                    "test_web_api.py": ""
-                },
-                "e2e": {
-                    "__init__.py": "",
-                    "test_complete_system.py": ""
-                },
-                "fixtures": {
-                    "excel_files": {},
-                    "mock_responses": {},
-                    "expected_outputs": {}
-                }
-            },
-            "docs": {
-                "api": {},
-                "architecture": {},
-                "user_guides": {},
-                "deployment": {}
-            },
-            "scripts": {
-                "setup.py": "",
-                "deploy.py": "",
-                "migration.py": ""
-            },
-            "config": {
-                "development.py": "",
-                "production.py": "",
-                "testing.py": ""
-            }
-        }
     
     def create_directory_structure(self):
         """Create the new directory structure"""
         logger.info("🏗️ Creating new directory structure...")
         
-        def create_nested_dirs(base_path: Path, structure: dict):
-            for name, content in structure.items():
-                path = base_path / name
-                
-                if isinstance(content, dict):
-                    path.mkdir(parents=True, exist_ok=True)
-                    create_nested_dirs(path, content)
-                else:
-                    path.parent.mkdir(parents=True, exist_ok=True)
-                    if not path.exists():
-                        path.touch()
+        # Plain string paths skip Path object construction for every entry
+        root = os.fspath(self.root_path) + "/"
+        for directory in NEW_DIRECTORIES:
+            os.makedirs(root + directory, exist_ok=True)
+        
+        def touch_missing(path: str):
+            if not os.path.lexists(path):
+                open(path, 'ab').close()
         
-        create_nested_dirs(self.root_path, self.new_structure)
+        # Every parent exists now, so the touches are independent syscalls
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            list(pool.map(touch_missing, [root + f for f in NEW_FILES]))
         logger.info("✅ Directory structure created")
     
     def move_existing_files(self):
@@ -304,17 +329,33 @@ class ProjectRestructurer:
             "README.md": "docs/README.md"
         }
         
+        # Group moves by target directory so each parent is created once
+        moves_by_parent = {}
         for source, target in file_mappings.items():
-            source_path = Path(source)
-            target_path = Path(target)
-            
-            if source_path.exists():
-                target_path.parent.mkdir(parents=True, exist_ok=True)
+            if os.path.lexists(source):
+                moves_by_parent.setdefault(os.path.dirname(target), []).append((source, target))
+        
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        moved = 0
+        for parent, moves in moves_by_parent.items():
+            os.makedirs(parent, exist_ok=True)
+            for source, target in moves:
                 try:
-                    shutil.move(str(source_path), str(target_path))
-                    logger.info(f"  ✅ Moved {source} → {target}")
+                    # Source and target share the repo root, so a rename is a
+                    # single syscall; only cross-device moves need copy+unlink
+                    try:
+                        os.replace(source, target)
+                    except OSError as e:
+                        if e.errno != errno.EXDEV:
+                            raise
+                        shutil.move(source, target)
+                    moved += 1
+                    if debug_enabled:
+                        logger.debug("  Moved %s -> %s", source, target)
                 except Exception as e:
                     logger.warning(f"  ⚠️ Could not move {source}: {str(e)}")
+        
+        logger.info("  ✅ Moved %d files", moved)
     
     def create_init_files(self):
         """Create proper __init__.py files with imports"""
@@ -372,8 +413,7 @@ from .frontend.app import create_app
         for file_path, content in init_contents.items():
             path = Path(file_path)
             path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            _write_if_changed(path, content.encode('utf-8'))
         
         logger.info("✅ __init__.py files created")
     
@@ -431,8 +471,7 @@ if __name__ == "__main__":
     main()
 '''
         
-        with open("main.py", 'w', encoding='utf-8') as f:
-            f.write(main_app_content)
+        _write_if_changed("main.py", main_app_content.encode('utf-8'))
         
         # Setup script
         setup_content = '''#!/usr/bin/env python3
@@ -471,8 +510,7 @@ if __name__ == "__main__":
     setup_environment()
 '''
         
-        with open("scripts/setup.py", 'w', encoding='utf-8') as f:
-            f.write(setup_content)
+        _write_if_changed("scripts/setup.py", setup_content.encode('utf-8'))
         
         logger.info("✅ Entry points created")
     
@@ -513,8 +551,7 @@ class DevelopmentConfig:
     DEMO_PROCESSING_DELAY = 1.0  # seconds between steps for visual effect
 '''
         
-        with open("config/development.py", 'w', encoding='utf-8') as f:
-            f.write(dev_config)
+        _write_if_changed("config/development.py", dev_config.encode('utf-8'))
         
         # Project configuration
         project_config = '''"""Project configuration and constants"""
@@ -552,8 +589,7 @@ SYSTEM_VERSION = "1.0.0"
 SYSTEM_DESCRIPTION = "AI-powered construction specification processing"
 '''
         
-        with open("src/infrastructure/config/settings.py", 'w', encoding='utf-8') as f:
-            f.write(project_config)
+        _write_if_changed("src/infrastructure/config/settings.py", project_config.encode('utf-8'))
         
         logger.info("✅ Configuration files created")
     
@@ -561,61 +597,12 @@ SYSTEM_DESCRIPTION = "AI-powered construction specification processing"
         """Update import statements in moved files"""
         logger.info("🔄 Updating import statements...")
         
-        # This would be a complex operation to update all imports
-        # For now, we'll create a simple import fix script
-        import_fix_content = '''#!/usr/bin/env python3
-"""
-Import Fix Script
-Updates import statements after restructuring
-"""
-
-import os
-import re
-from pathlib import Path
-
-def fix_imports():
-    """Fix import statements in all Python files"""
-    
-    import_mappings = {
-        "from excel_parser_agent import": "from src.domains.parsing.agents.excel_parser_agent import",
-        "from supplier_mapping_agent import": "from src.domains.suppliers.agents.supplier_mapping_agent import",
-        "from communication_agent import": "from src.domains.communication.agents.communication_agent import",
-        "from response_parser_agent import": "from src.domains.responses.agents.response_parser_agent import",
-        "from quote_calculator_agent import": "from src.domains.quotes.agents.quote_calculator_agent import",
-        "from document_generator_agent import": "from src.domains.documents.agents.document_generator_agent import",
-    }
-    
-    for root, dirs, files in os.walk("src"):
-        for file in files:
-            if file.endswith(".py"):
-                file_path = Path(root) / file
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    updated = False
-                    for old_import, new_import in import_mappings.items():
-                        if old_import in content:
-                            content = content.replace(old_import, new_import)
-                            updated = True
-                    
-                    if updated:
-                        with open(file_path, 'w', encoding='utf-8') as f:
-                            f.write(content)
-                        print(f"Updated imports in: {file_path}")
-                        
-                except Exception as e:
-                    print(f"Error updating {file_path}: {e}")
-
-if __name__ == "__main__":
-    fix_imports()
-'''
-        
-        with open("scripts/fix_imports.py", 'w', encoding='utf-8') as f:
-            f.write(import_fix_content)
+        # scripts/fix_imports.py is the single source of the import mappings
+        sys.path.insert(0, str(Path("scripts").resolve()))
+        from fix_imports import fix_imports
+        fix_imports()
         
-        logger.info("✅ Import fix script created")
+        logger.info("✅ Import statements updated")
     
     def create_documentation(self):
         """Create updated documentation"""
@@ -707,8 +694,7 @@ src/
 - **Performance Tests**: Speed and accuracy metrics
 '''
         
-        with open("docs/architecture/domain_design.md", 'w', encoding='utf-8') as f:
-            f.write(architecture_doc)
+        _write_if_changed("docs/architecture/domain_design.md", architecture_doc.encode('utf-8'))
         
         logger.info("✅ Documentation created")
     
@@ -720,9 +706,11 @@ src/
         backup_dir = Path("backup_old_structure")
         if not backup_dir.exists():
             logger.info("💾 Creating backup of current structure...")
-            shutil.copytree(".", backup_dir, ignore=shutil.ignore_patterns(
+            # Immutable assets are hardlinked; everything else is copied
+            # through shutil's sendfile fast path
+            _parallel_copytree(".", backup_dir, ignore=shutil.ignore_patterns(
                 'venv', '__pycache__', '*.pyc', '.git', 'backup_*'
-            ))
+            ), copy_function=_snapshot_file)
         
         # Execute restructuring steps
         self.create_directory_structure()
@@ -751,8 +739,7 @@ src/
 
 🚀 Next Steps:
   1. Run: python scripts/setup.py
-  2. Run: python scripts/fix_imports.py
-  3. Run: python main.py demo
+  2. Run: python main.py demo
 
 📚 Documentation: docs/architecture/domain_design.md
         """)
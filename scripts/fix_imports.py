@@ -4,44 +4,103 @@ Import Fix Script
 Updates import statements after restructuring
 """
 
+import mmap
 import os
-import re
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+IMPORT_MAPPINGS = {
+    "from excel_parser_agent import": "from src.domains.parsing.agents.excel_parser_agent import",
+    "from supplier_mapping_agent import": "from src.domains.suppliers.agents.supplier_mapping_agent import",
+    "from communication_agent import": "from src.domains.communication.agents.communication_agent import",
+    "from response_parser_agent import": "from src.domains.responses.agents.response_parser_agent import",
+    "from quote_calculator_agent import": "from src.domains.quotes.agents.quote_calculator_agent import",
+    "from document_generator_agent import": "from src.domains.documents.agents.document_generator_agent import",
+}
+
+# Every old import ends with this; matches are anchored on it and then
+# checked backwards against the agent names, all on raw bytes
+_TRIGGER = b"_agent import"
+_PREFIX = b"from "
+
+_AGENT_MODULES = {
+    old[len("from "):-len("_agent import")].encode(): new[len("from "):-len("_agent import")].encode()
+    for old, new in IMPORT_MAPPINGS.items()
+}
+_MAX_LOOKBEHIND = len(_PREFIX) + max(map(len, _AGENT_MODULES))
+
+def _rewrite_imports(raw):
+    """Return raw with old imports rewritten, or None if nothing matched"""
+    parts = []
+    last = 0
+    i = raw.find(_TRIGGER)
+    while i >= 0:
+        j = raw.rfind(_PREFIX, max(0, i - _MAX_LOOKBEHIND), i)
+        if j >= 0:
+            module = _AGENT_MODULES.get(raw[j + len(_PREFIX):i])
+            if module is not None:
+                parts.append(raw[last:j + len(_PREFIX)])
+                parts.append(module)
+                last = i
+        i = raw.find(_TRIGGER, i + len(_TRIGGER))
+    if not parts:
+        return None
+    parts.append(raw[last:])
+    return b"".join(parts)
+
+def _iter_py_files(root):
+    """Yield paths of .py files under root using scandir's cached entry types"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".py") and entry.is_file(follow_symlinks=False):
+                        yield entry.path
+        except OSError:
+            continue
+
+def _fix_file(file_path):
+    """Rewrite old imports in one file, returning whether it changed"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        # Most files have no old imports; check the mapping before copying it out
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            if mm.find(_TRIGGER) < 0:
+                return False
+            raw = mm[:]
+    content = _rewrite_imports(raw)
+    if content is None:
+        return False
+    
+    # A hardlinked backup snapshot must keep the original contents
+    if os.stat(file_path).st_nlink > 1:
+        os.unlink(file_path)
+    with open(file_path, 'wb') as f:
+        f.write(content)
+    return True
 
 def fix_imports():
     """Fix import statements in all Python files"""
     
-    import_mappings = {
-        "from excel_parser_agent import": "from src.domains.parsing.agents.excel_parser_agent import",
-        "from supplier_mapping_agent import": "from src.domains.suppliers.agents.supplier_mapping_agent import",
-        "from communication_agent import": "from src.domains.communication.agents.communication_agent import",
-        "from response_parser_agent import": "from src.domains.responses.agents.response_parser_agent import",
-        "from quote_calculator_agent import": "from src.domains.quotes.agents.quote_calculator_agent import",
-        "from document_generator_agent import": "from src.domains.documents.agents.document_generator_agent import",
-    }
+    # Files are independent, so overlap their reads and writes on a thread pool
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+        futures = {pool.submit(_fix_file, path): path for path in _iter_py_files("src")}
+        updated = []
+        for future, file_path in futures.items():
+            try:
+                if future.result():
+                    updated.append(file_path)
+            except Exception as e:
+                print(f"Error updating {file_path}: {e}")
     
-    for root, dirs, files in os.walk("src"):
-        for file in files:
-            if file.endswith(".py"):
-                file_path = Path(root) / file
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    updated = False
-                    for old_import, new_import in import_mappings.items():
-                        if old_import in content:
-                            content = content.replace(old_import, new_import)
-                            updated = True
-                    
-                    if updated:
-                        with open(file_path, 'w', encoding='utf-8') as f:
-                            f.write(content)
-                        print(f"Updated imports in: {file_path}")
-                        
-                except Exception as e:
-                    print(f"Error updating {file_path}: {e}")
+    if updated:
+        print(f"Updated imports in {len(updated)} files:\n" + "\n".join(f"  {path}" for path in updated))
 
 if __name__ == "__main__":
     fix_imports()
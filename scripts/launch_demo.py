@@ -4,12 +4,13 @@ Demo Launcher for Construction Industry Agents
 Easy way to start different types of demonstrations
 """
 
-import subprocess
+import importlib
+import multiprocessing
+import socket
 import sys
 import os
 import time
 import webbrowser
-from pathlib import Path
 
 def print_header():
     """Print demo launcher header"""
@@ -22,9 +23,12 @@ def check_dependencies():
     """Check if all dependencies are available"""
     print("🔍 Checking system dependencies...")
     
+    # One directory read answers every existence check below
+    with os.scandir(".") as it:
+        present = {entry.name for entry in it}
+    
     # Check if virtual environment exists
-    venv_path = Path("venv")
-    if not venv_path.exists():
+    if "venv" not in present:
         print("❌ Virtual environment not found. Please run:")
         print("   python -m venv venv")
         print("   source venv/bin/activate")
@@ -32,7 +36,7 @@ def check_dependencies():
         return False
     
     # Check if all agent files exist
-    required_files = [
+    required_files = (
         "excel_parser_agent.py",
         "supplier_mapping_agent.py",
         "communication_agent.py",
@@ -42,9 +46,9 @@ def check_dependencies():
         "workflow_orchestrator.py",
         "visual_workflow_monitor.py",
         "web_frontend.py"
-    ]
+    )
     
-    missing_files = [f for f in required_files if not Path(f).exists()]
+    missing_files = [f for f in required_files if f not in present]
     if missing_files:
         print(f"❌ Missing files: {missing_files}")
         print("   Please run: python system_builder.py")
@@ -53,6 +57,59 @@ def check_dependencies():
     print("✅ All dependencies found!")
     return True
 
+WEB_PORT = 5000
+
+def _import_from_cwd():
+    """Make modules in the working directory importable, like the files checked above"""
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+def run_script_main(module_name, *args):
+    """Run a sibling script's main() in this interpreter instead of a new process"""
+    _import_from_cwd()
+    module = importlib.import_module(module_name)
+    saved_argv = sys.argv
+    sys.argv = [f"{module_name}.py", *args]
+    try:
+        module.main()
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise RuntimeError(f"{module_name} exited with status {e.code}") from e
+    finally:
+        sys.argv = saved_argv
+
+def _run_web_frontend():
+    """Process target for the web demo server"""
+    _import_from_cwd()
+    from src.web.frontend.app import run_server
+    run_server(host="0.0.0.0", port=WEB_PORT)
+
+def _web_process_context():
+    """Start the web server from a forkserver preloaded with its heavy imports"""
+    try:
+        ctx = multiprocessing.get_context("forkserver")
+    except ValueError:  # no forkserver on Windows
+        return multiprocessing.get_context("spawn")
+    # Modules that are not installed are skipped by the forkserver
+    ctx.set_forkserver_preload(["flask", "pandas", "openpyxl"])
+    return ctx
+
+def wait_for_port(port, process=None, timeout=10.0):
+    """Wait until something accepts connections on localhost:port
+
+    Gives up early if the process expected to serve the port has exited.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and not process.is_alive():
+            return False
+        try:
+            with socket.create_connection(("localhost", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
 def launch_web_demo():
     """Launch the web frontend demo"""
     print("🌐 Starting Web Frontend Demo...")
@@ -61,17 +118,21 @@ def launch_web_demo():
     
     try:
         # Start the web server
-        process = subprocess.Popen([
-            sys.executable, "web_frontend.py"
-        ], cwd=os.getcwd())
+        process = _web_process_context().Process(target=_run_web_frontend)
+        process.start()
         
-        # Wait a moment for server to start
+        # Wait for the server to accept connections
         print("⏳ Starting server...")
-        time.sleep(3)
+        if not wait_for_port(WEB_PORT, process):
+            print(f"❌ Web server did not start on port {WEB_PORT}")
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            return
         
         # Open browser
-        print("🌐 Opening browser at http://localhost:5000")
-        webbrowser.open("http://localhost:5000")
+        print(f"🌐 Opening browser at http://localhost:{WEB_PORT}")
+        webbrowser.open(f"http://localhost:{WEB_PORT}")
         
         print("✅ Web demo launched successfully!")
         print("📋 Instructions:")
@@ -83,10 +144,11 @@ def launch_web_demo():
         
         # Wait for user to stop
         try:
-            process.wait()
+            process.join()
         except KeyboardInterrupt:
             print("\n🛑 Stopping web server...")
             process.terminate()
+            process.join()
             print("✅ Web server stopped")
         
     except Exception as e:
@@ -99,9 +161,9 @@ def launch_terminal_demo():
     print()
     
     try:
-        subprocess.run([sys.executable, "visual_workflow_monitor.py"], check=True)
+        run_script_main("visual_workflow_monitor")
         print("✅ Terminal demo completed!")
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"❌ Error running terminal demo: {str(e)}")
     except KeyboardInterrupt:
         print("\n🛑 Demo interrupted by user")
@@ -113,9 +175,9 @@ def run_quick_test():
     print()
     
     try:
-        subprocess.run([sys.executable, "test_runner.py", "quick"], check=True)
+        run_script_main("test_runner", "quick")
         print("✅ Quick test completed!")
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"❌ Error running test: {str(e)}")
 
 def run_full_workflow():
@@ -125,9 +187,9 @@ def run_full_workflow():
     print()
     
     try:
-        subprocess.run([sys.executable, "workflow_orchestrator.py"], check=True)
+        run_script_main("workflow_orchestrator")
         print("✅ Workflow completed!")
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"❌ Error running workflow: {str(e)}")
 
 def show_architecture():
@@ -7,15 +7,47 @@ Sends requests to suppliers via email and API calls
 import smtplib
 import logging
 import json
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from pathlib import Path
+from string import Template
 import time
 
 logger = logging.getLogger(__name__)
 
+# Politeness cap: bursts of up to MAX_CONCURRENT_SENDS, refilled at that many
+# sends per SEND_INTERVAL seconds
+MAX_CONCURRENT_SENDS = 8
+SEND_INTERVAL = 1.0
+
+class _TokenBucket:
+    """Thread-safe token bucket on the monotonic clock"""
+    
+    def __init__(self, capacity: int, per_seconds: float):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until it is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now so waiters are served in arrival order
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
 @dataclass
 class CommunicationRequest:
     """Request to be sent to supplier"""
@@ -38,66 +70,90 @@ class CommunicationResult:
 class CommunicationAgent:
     """Handles communication with suppliers"""
     
-    def __init__(self, smtp_server: str = None, smtp_port: int = 587):
-        self.smtp_server = smtp_server or "smtp.gmail.com"
-        self.smtp_port = smtp_port
-        self.email_templates = self._load_email_templates()
-        
-    def _load_email_templates(self) -> Dict[str, str]:
-        """Load email templates"""
-        return {
-            "standard": """
+    # Parsed once at import and shared by every agent instance
+    _TEMPLATES: Dict[str, Template] = {
+        "standard": Template("""
 Poštovani,
 
 Molimo Vas da nam dostavite ponudu za sledeće pozicije:
 
-{items_list}
+$items_list
 
 Molimo da odgovorite sa cenama u najkraćem mogućem roku.
 
 Hvala vam,
 Konstrukcijski tim
-""",
-            "urgent": """
+"""),
+        "urgent": Template("""
 HITNO - Ponuda potrebna
 
 Poštovani,
 
 Hitno potrebna ponuda za:
-{items_list}
+$items_list
 
 Odgovorite u roku od 2 sata.
 
 Hvala,
 Konstrukcijski tim
-"""
-        }
+""")
+    }
+    
+    def __init__(self, smtp_server: str = None, smtp_port: int = 587):
+        self.smtp_server = smtp_server or "smtp.gmail.com"
+        self.smtp_port = smtp_port
+        self.email_templates = self._TEMPLATES
+        # Threads are only spawned on first use, so creating the pool here is cheap
+        self._pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SENDS,
+                                        thread_name_prefix="supplier-send")
+        self._rate_limit = _TokenBucket(MAX_CONCURRENT_SENDS, SEND_INTERVAL)
     
     def send_requests(self, requests: List[CommunicationRequest]) -> List[CommunicationResult]:
         """Send requests to all suppliers"""
         logger.info(f"Sending {len(requests)} requests to suppliers...")
         
-        results = []
-        
-        for request in requests:
-            result = self._send_single_request(request)
-            results.append(result)
-            
-            # Rate limiting
-            time.sleep(1)
+        results = list(self._pool.map(self._rate_limited_send, requests))
         
         success_count = sum(1 for r in results if r.success)
         logger.info(f"Successfully sent {success_count}/{len(results)} requests")
         
         return results
     
+    def close(self):
+        """Shut down the worker threads used by send_requests"""
+        self._pool.shutdown()
+    
+    def _rate_limited_send(self, request: CommunicationRequest) -> CommunicationResult:
+        """Send once the shared rate limit allows it"""
+        self._rate_limit.acquire()
+        return self._send_single_request(request)
+    
+    def send_batch(self, requests: List[CommunicationRequest]) -> List[CommunicationResult]:
+        """Send requests for one mail domain over a single connection"""
+        with self._open_connection():
+            return [self._rate_limited_send(request) for request in requests]
+    
+    @staticmethod
+    def group_by_domain(requests: List[CommunicationRequest]) -> Dict[str, List[CommunicationRequest]]:
+        """Bucket requests by supplier email domain so each bucket can share a connection"""
+        batches = defaultdict(list)
+        for request in requests:
+            batches[request.supplier_email.rpartition('@')[2].lower()].append(request)
+        return dict(batches)
+    
+    def _open_connection(self):
+        """Open the connection shared by a batch of sends"""
+        # Demo mode only logs emails, so there is nothing to open yet.
+        # In real implementation: return smtplib.SMTP(self.smtp_server, self.smtp_port)
+        return nullcontext()
+    
     def _send_single_request(self, request: CommunicationRequest) -> CommunicationResult:
         """Send request to a single supplier"""
         try:
             # For demo purposes, we'll just log the email instead of actually sending
             items_text = self._format_items_for_email(request.items)
-            template = self.email_templates.get(request.message_template, self.email_templates["standard"])
-            message = template.format(items_list=items_text)
+            template = self._TEMPLATES.get(request.message_template, self._TEMPLATES["standard"])
+            message = template.substitute(items_list=items_text)
             
             logger.info(f"📧 [DEMO] Sending email to {request.supplier_name} ({request.supplier_email})")
             logger.info(f"Subject: Zahtev za ponudu - {request.request_id}")
@@ -127,13 +183,11 @@ Konstrukcijski tim
     
     def _format_items_for_email(self, items: List[Dict]) -> str:
         """Format items list for email"""
-        lines = []
-        for i, item in enumerate(items, 1):
-            lines.append(f"{i}. {item.get('description', 'N/A')}")
-            lines.append(f"   Količina: {item.get('quantity', 0)} {item.get('unit', '')}")
-            lines.append("")
-        
-        return "\n".join(lines)
+        return "\n".join(
+            f"{i}. {item.get('description', 'N/A')}\n"
+            f"   Količina: {item.get('quantity', 0)} {item.get('unit', '')}\n"
+            for i, item in enumerate(items, 1)
+        )
     
     def export_communication_log(self, results: List[CommunicationResult], output_path: str):
         """Export communication results to JSON"""
@@ -8,12 +8,35 @@ import json
 import logging
 from typing import Dict, List, Optional
 from dataclasses import dataclass
+from importlib.util import find_spec
 from pathlib import Path
-import pandas as pd
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# pandas and the Excel engines are imported only by the code that writes
+# workbooks, so importing the agent stays cheap. xlsxwriter is optional and
+# faster for write-only workbooks; openpyxl is the fallback. xlsxwriter's
+# constant_memory mode is not usable here: pandas writes cells column by
+# column, and that mode drops any cell written to an earlier row.
+EXCEL_ENGINE = 'xlsxwriter' if find_spec('xlsxwriter') is not None else 'openpyxl'
+
+def _excel_writer(file_path: Path):
+    """Open a write-only pandas ExcelWriter with the preferred engine"""
+    import pandas as pd
+    return pd.ExcelWriter(file_path, engine=EXCEL_ENGINE)
+
+def _write_sheet_header(writer, sheet_name: str, lines: List[str]):
+    """Create a sheet with lines in column A, leaving room for a table below"""
+    if EXCEL_ENGINE == 'xlsxwriter':
+        worksheet = writer.book.add_worksheet(sheet_name)
+        for row, line in enumerate(lines):
+            worksheet.write(row, 0, line)
+    else:
+        worksheet = writer.book.create_sheet(sheet_name)
+        for row, line in enumerate(lines, 1):
+            worksheet.cell(row=row, column=1, value=line)
+
 @dataclass
 class DocumentTemplate:
     """Document template configuration"""
@@ -48,13 +71,18 @@ class DocumentGeneratorAgent:
             )
         }
     
-    def generate_documents(self, quote_data: Dict, output_folder: str = "output") -> List[str]:
-        """Generate all document types for a quote"""
+    def generate_documents(self, quote_data: Dict, output_folder: str = "output", split: bool = True) -> List[str]:
+        """Generate all document types for a quote, as separate files or one combined workbook"""
         logger.info("Generating quote documents...")
         
         output_path = Path(output_folder)
         output_path.mkdir(parents=True, exist_ok=True)
         
+        if not split:
+            # One workbook pays the per-file setup and zip finalize cost once
+            combined_file = self._generate_combined_quote(quote_data, output_path)
+            return [combined_file] if combined_file else []
+        
         generated_files = []
         
         # Generate standard quote
@@ -82,71 +110,8 @@ class DocumentGeneratorAgent:
             filename = f"{quote_id}_standard_quote.xlsx"
             file_path = output_path / filename
             
-            # Prepare data for Excel
-            items_data = []
-            for item in quote_data.get('items', []):
-                items_data.append({
-                    'Pozicija': item.get('position', ''),
-                    'Opis': item.get('description', ''),
-                    'Količina': item.get('quantity', 0),
-                    'J.M.': item.get('unit', ''),
-                    'Jedinična cena': f"{item.get('final_unit_price', 0):,.2f} RSD",
-                    'Ukupno': f"{item.get('final_total_price', 0):,.2f} RSD",
-                    'Dobavljač': item.get('selected_supplier', '')
-                })
-            
-            # Create DataFrame
-            df = pd.DataFrame(items_data)
-            
-            # Add summary row
-            summary = quote_data.get('summary', {})
-            summary_row = {
-                'Pozicija': '',
-                'Opis': 'UKUPNO pre PDV-a:',
-                'Količina': '',
-                'J.M.': '',
-                'Jedinična cena': '',
-                'Ukupno': f"{summary.get('final_total', 0) - summary.get('tax_total', 0):,.2f} RSD",
-                'Dobavljač': ''
-            }
-            
-            tax_row = {
-                'Pozicija': '',
-                'Opis': 'PDV (20%):',
-                'Količina': '',
-                'J.M.': '',
-                'Jedinična cena': '',
-                'Ukupno': f"{summary.get('tax_total', 0):,.2f} RSD",
-                'Dobavljač': ''
-            }
-            
-            final_row = {
-                'Pozicija': '',
-                'Opis': 'UKUPNO sa PDV:',
-                'Količina': '',
-                'J.M.': '',
-                'Jedinična cena': '',
-                'Ukupno': f"{summary.get('final_total', 0):,.2f} RSD",
-                'Dobavljač': ''
-            }
-            
-            # Add summary rows
-            df = pd.concat([df, pd.DataFrame([summary_row, tax_row, final_row])], ignore_index=True)
-            
-            # Write to Excel
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                # Main quote sheet
-                df.to_excel(writer, sheet_name='Ponuda', index=False)
-                
-                # Add header info
-                worksheet = writer.sheets['Ponuda']
-                worksheet.insert_rows(1, 5)
-                
-                # Add header information
-                worksheet['A1'] = f"PONUDA BR: {quote_id}"
-                worksheet['A2'] = f"Datum: {datetime.now().strftime('%d.%m.%Y')}"
-                worksheet['A3'] = "Konstrukcijski projekat"
-                worksheet['A4'] = ""  # Empty row
+            with _excel_writer(file_path) as writer:
+                self._write_standard_sheet(writer, quote_data)
                 
             logger.info(f"Standard quote generated: {file_path}")
             return str(file_path)
@@ -162,35 +127,8 @@ class DocumentGeneratorAgent:
             filename = f"{quote_id}_detailed_quote.xlsx"
             file_path = output_path / filename
             
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                # Main quote sheet
-                items_data = []
-                for item in quote_data.get('items', []):
-                    items_data.append({
-                        'Pozicija': item.get('position', ''),
-                        'Opis': item.get('description', ''),
-                        'Količina': item.get('quantity', 0),
-                        'J.M.': item.get('unit', ''),
-                        'Nabavna cena': f"{item.get('best_unit_price', 0):,.2f}",
-                        'Marža (%)': f"{item.get('margin_percentage', 0)*100:.1f}%",
-                        'Prodajna cena': f"{item.get('final_unit_price', 0):,.2f}",
-                        'Ukupno': f"{item.get('final_total_price', 0):,.2f}",
-                        'Dobavljač': item.get('selected_supplier', '')
-                    })
-                
-                df_items = pd.DataFrame(items_data)
-                df_items.to_excel(writer, sheet_name='Detaljna ponuda', index=False)
-                
-                # Supplier breakdown sheet
-                supplier_data = []
-                for supplier, total in quote_data.get('supplier_breakdown', {}).items():
-                    supplier_data.append({
-                        'Dobavljač': supplier,
-                        'Ukupno': f"{total:,.2f} RSD"
-                    })
-                
-                df_suppliers = pd.DataFrame(supplier_data)
-                df_suppliers.to_excel(writer, sheet_name='Po dobavljačima', index=False)
+            with _excel_writer(file_path) as writer:
+                self._write_detailed_sheets(writer, quote_data)
             
             logger.info(f"Detailed quote generated: {file_path}")
             return str(file_path)
@@ -206,20 +144,8 @@ class DocumentGeneratorAgent:
             filename = f"{quote_id}_supplier_comparison.xlsx"
             file_path = output_path / filename
             
-            # Create comparison data (simplified for demo)
-            comparison_data = []
-            for item in quote_data.get('items', []):
-                comparison_data.append({
-                    'Pozicija': item.get('position', ''),
-                    'Opis': item.get('description', ''),
-                    'Izabrani dobavljač': item.get('selected_supplier', ''),
-                    'Najbolja cena': f"{item.get('best_unit_price', 0):,.2f} RSD",
-                    'Finalna cena': f"{item.get('final_unit_price', 0):,.2f} RSD",
-                    'Status': '✅ Odabrano'
-                })
-            
-            df_comparison = pd.DataFrame(comparison_data)
-            df_comparison.to_excel(file_path, sheet_name='Poređenje dobavljača', index=False)
+            with _excel_writer(file_path) as writer:
+                self._write_comparison_sheet(writer, quote_data)
             
             logger.info(f"Supplier comparison generated: {file_path}")
             return str(file_path)
@@ -228,6 +154,122 @@ class DocumentGeneratorAgent:
             logger.error(f"Error generating supplier comparison: {str(e)}")
             return None
     
+    def _generate_combined_quote(self, quote_data: Dict, output_path: Path) -> Optional[str]:
+        """Generate one workbook holding every quote sheet"""
+        try:
+            quote_id = quote_data.get('quote_id', 'QUOTE001')
+            filename = f"{quote_id}_quote.xlsx"
+            file_path = output_path / filename
+            
+            with _excel_writer(file_path) as writer:
+                self._write_standard_sheet(writer, quote_data)
+                self._write_detailed_sheets(writer, quote_data)
+                self._write_comparison_sheet(writer, quote_data)
+            
+            logger.info(f"Combined quote generated: {file_path}")
+            return str(file_path)
+            
+        except Exception as e:
+            logger.error(f"Error generating combined quote: {str(e)}")
+            return None
+    
+    def _write_standard_sheet(self, writer, quote_data: Dict):
+        """Write the 'Ponuda' sheet: header lines, items and totals"""
+        import pandas as pd
+        
+        quote_id = quote_data.get('quote_id', 'QUOTE001')
+        
+        # Prepare data for Excel, one list per column
+        positions, descriptions, quantities, units = [], [], [], []
+        unit_prices, total_prices, suppliers = [], [], []
+        for item in quote_data.get('items', []):
+            positions.append(item.get('position', ''))
+            descriptions.append(item.get('description', ''))
+            quantities.append(item.get('quantity', 0))
+            units.append(item.get('unit', ''))
+            unit_prices.append(item.get('final_unit_price', 0))
+            total_prices.append(item.get('final_total_price', 0))
+            suppliers.append(item.get('selected_supplier', ''))
+        
+        # Summary rows go straight into the columns instead of a concat copy
+        summary = quote_data.get('summary', {})
+        final_total = summary.get('final_total', 0)
+        tax_total = summary.get('tax_total', 0)
+        summary_labels = ['UKUPNO pre PDV-a:', 'PDV (20%):', 'UKUPNO sa PDV:']
+        summary_totals = [final_total - tax_total, tax_total, final_total]
+        blank = [''] * len(summary_labels)
+        
+        # Create DataFrame
+        df = pd.DataFrame({
+            'Pozicija': positions + blank,
+            'Opis': descriptions + summary_labels,
+            'Količina': quantities + blank,
+            'J.M.': units + blank,
+            'Jedinična cena': [f"{price:,.2f} RSD" for price in unit_prices] + blank,
+            'Ukupno': [f"{price:,.2f} RSD" for price in total_prices + summary_totals],
+            'Dobavljač': suppliers + blank
+        })
+        
+        # Header information, then the quote table below it
+        _write_sheet_header(writer, 'Ponuda', [
+            f"PONUDA BR: {quote_id}",
+            f"Datum: {datetime.now().strftime('%d.%m.%Y')}",
+            "Konstrukcijski projekat"
+        ])
+        df.to_excel(writer, sheet_name='Ponuda', index=False, startrow=5)
+    
+    def _write_detailed_sheets(self, writer, quote_data: Dict):
+        """Write the per-item breakdown and per-supplier totals sheets"""
+        import pandas as pd
+        
+        # Main quote sheet
+        items_data = []
+        for item in quote_data.get('items', []):
+            items_data.append({
+                'Pozicija': item.get('position', ''),
+                'Opis': item.get('description', ''),
+                'Količina': item.get('quantity', 0),
+                'J.M.': item.get('unit', ''),
+                'Nabavna cena': f"{item.get('best_unit_price', 0):,.2f}",
+                'Marža (%)': f"{item.get('margin_percentage', 0)*100:.1f}%",
+                'Prodajna cena': f"{item.get('final_unit_price', 0):,.2f}",
+                'Ukupno': f"{item.get('final_total_price', 0):,.2f}",
+                'Dobavljač': item.get('selected_supplier', '')
+            })
+        
+        df_items = pd.DataFrame(items_data)
+        df_items.to_excel(writer, sheet_name='Detaljna ponuda', index=False)
+        
+        # Supplier breakdown sheet
+        supplier_data = []
+        for supplier, total in quote_data.get('supplier_breakdown', {}).items():
+            supplier_data.append({
+                'Dobavljač': supplier,
+                'Ukupno': f"{total:,.2f} RSD"
+            })
+        
+        df_suppliers = pd.DataFrame(supplier_data)
+        df_suppliers.to_excel(writer, sheet_name='Po dobavljačima', index=False)
+    
+    def _write_comparison_sheet(self, writer, quote_data: Dict):
+        """Write the supplier price comparison sheet"""
+        import pandas as pd
+        
+        # Create comparison data (simplified for demo)
+        comparison_data = []
+        for item in quote_data.get('items', []):
+            comparison_data.append({
+                'Pozicija': item.get('position', ''),
+                'Opis': item.get('description', ''),
+                'Izabrani dobavljač': item.get('selected_supplier', ''),
+                'Najbolja cena': f"{item.get('best_unit_price', 0):,.2f} RSD",
+                'Finalna cena': f"{item.get('final_unit_price', 0):,.2f} RSD",
+                'Status': '✅ Odabrano'
+            })
+        
+        df_comparison = pd.DataFrame(comparison_data)
+        df_comparison.to_excel(writer, sheet_name='Poređenje dobavljača', index=False)
+    
     def generate_summary_report(self, quote_data: Dict, output_path: str = "quote_summary.txt") -> str:
         """Generate a text summary report"""
         try:
@@ -13,7 +13,8 @@ import pandas as pd
 import openpyxl
 from typing import Dict, List, Optional, Tuple, Any
 import re
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from operator import attrgetter
 import json
 import sys
 from pathlib import Path
@@ -49,7 +50,15 @@ class ConstructionItem:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
-        return asdict(self)
+        return dict(zip(CONSTRUCTION_ITEM_FIELDS, _construction_item_values(self)))
+
+# All ConstructionItem fields are scalars, so a flat attrgetter replaces asdict's recursive copy
+CONSTRUCTION_ITEM_FIELDS = tuple(field.name for field in fields(ConstructionItem))
+_construction_item_values = attrgetter(*CONSTRUCTION_ITEM_FIELDS)
+
+def items_to_dicts(items: List[ConstructionItem]) -> List[Dict[str, Any]]:
+    """Convert parsed items to dictionaries in one pass"""
+    return [dict(zip(CONSTRUCTION_ITEM_FIELDS, _construction_item_values(item))) for item in items]
 
 class LLMEnhancementAgent:
     """
@@ -758,7 +767,7 @@ class ExcelParserAgent:
         else:
             output_path = Path(output_folder) / output_path
         
-        data = [item.to_dict() for item in items]
+        data = items_to_dicts(items)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
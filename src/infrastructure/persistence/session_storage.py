@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Session Storage for Construction Industry Agents
+In-memory registry of live web sessions with size and age limits
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class SessionStore:
+    """Thread-safe session registry that forgets stale and finished sessions"""
+
+    def __init__(self, maxsize: int = 64, ttl: float = 600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._sessions = OrderedDict()  # session_id -> (created_at, value), oldest first
+        self._lock = threading.Lock()
+
+    def add(self, session_id: str, value: Any):
+        """Register a session, evicting expired and then oldest entries"""
+        with self._lock:
+            self._evict_expired()
+            self._sessions[session_id] = (time.monotonic(), value)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.maxsize:
+                self._sessions.popitem(last=False)
+
+    def get(self, session_id: str) -> Optional[Any]:
+        """Return the session value, or None if unknown or expired"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._sessions[session_id]
+                return None
+            return entry[1]
+
+    def discard(self, session_id: str):
+        """Forget a session if it is still registered"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def discard_later(self, session_id: str, delay: float):
+        """Forget a session after a grace period, e.g. once its work is done"""
+        timer = threading.Timer(delay, self.discard, args=(session_id,))
+        timer.daemon = True
+        timer.start()
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def _evict_expired(self):
+        """Drop entries older than the TTL; caller holds the lock"""
+        cutoff = time.monotonic() - self.ttl
+        while self._sessions:
+            session_id, (created_at, _) = next(iter(self._sessions.items()))
+            if created_at > cutoff:
+                break
+            del self._sessions[session_id]
@@ -4,60 +4,213 @@ Web Frontend for Construction Industry Agents
 Real-time demonstration with visual process flow and mock data
 """
 
-from flask import Flask, render_template, jsonify, request, send_file
+from flask import Flask, Response, jsonify, request, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import json
 import time
 import threading
-import queue
+import functools
+import gzip
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from operator import attrgetter, itemgetter
+from collections import defaultdict, deque
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
 import uuid
 import os
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; Flask's stdlib encoder is used instead
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; the demo page is then served gzipped
+    brotli = None
+
 # Import our agents
-from src.domains.parsing.agents.excel_parser_agent import ExcelParserAgent, create_test_excel
+from src.domains.parsing.agents.excel_parser_agent import ExcelParserAgent, create_test_excel, items_to_dicts
 from src.domains.suppliers.agents.supplier_mapping_agent import SupplierMappingAgent
 from src.domains.communication.agents.communication_agent import CommunicationAgent, CommunicationRequest
 from src.domains.responses.agents.response_parser_agent import ResponseParserAgent
 from src.domains.quotes.agents.quote_calculator_agent import QuoteCalculatorAgent
 from src.domains.documents.agents.document_generator_agent import DocumentGeneratorAgent
+from src.infrastructure.persistence.session_storage import SessionStore
+
+def _json_default(obj):
+    """Encode datetimes as ISO 8601 strings, matching orjson's output"""
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson when it is installed"""
+    
+    default = staticmethod(_json_default)
+    
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(
+            obj, default=self.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+    
+    def loads(self, s, **kwargs):
+        if orjson is None:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)
 
-# Global state for demo
-demo_sessions = {}
-progress_queues = {}
+# Global state for demo: finished sessions linger briefly so clients can
+# drain their last updates, and abandoned ones expire after SESSION_TTL_SECONDS
+SESSION_TTL_SECONDS = 600
+FINISHED_SESSION_GRACE_SECONDS = 60
+demo_sessions = SessionStore(maxsize=64, ttl=SESSION_TTL_SECONDS)
+
+# Workflows run on a bounded pool; extra demos queue until a worker frees up
+WORKFLOW_POOL = ThreadPoolExecutor(
+    max_workers=min(8, (os.cpu_count() or 1) * 2),
+    thread_name_prefix='wf'
+)
+
+# Demo supplier responses: each supplier quotes the first few items at a fixed factor
+DEMO_RESPONSE_SUPPLIERS = ('HVAC Sistem doo', 'Elektro Montaža', 'Izolacija Plus')
+DEMO_PRICE_FACTORS = tuple(0.9 + (i * 0.1) for i in range(len(DEMO_RESPONSE_SUPPLIERS)))  # 0.9, 1.0, 1.1
+DEMO_RESPONSE_ITEM_COUNT = 2
+
+# Parsed demo spreadsheet, shared by every mock-data session
+_demo_items_cache = None
+_demo_items_lock = threading.Lock()
+
+# Generated quote documents; when DOWNLOAD_ACCEL_PREFIX is set (e.g. "/internal/")
+# downloads are handed to a fronting nginx via X-Accel-Redirect instead of Flask
+WEB_OUTPUT_DIR = Path("web_demo_output")
+DOWNLOAD_ACCEL_PREFIX = os.getenv('DOWNLOAD_ACCEL_PREFIX')
+
+# Upper bound on undelivered progress updates per session
+MAX_QUEUED_UPDATES = 256
+
+# QuoteItem fields passed on to document generation
+QUOTE_ITEM_FIELDS = (
+    'position', 'description', 'quantity', 'unit', 'best_unit_price',
+    'margin_percentage', 'final_unit_price', 'final_total_price', 'selected_supplier'
+)
+_quote_item_values = attrgetter(*QUOTE_ITEM_FIELDS)
+
+# Progress steps that end a workflow's event stream
+FINAL_STEPS = ('workflow_complete', 'error')
+# Pseudo-step carrying the merged dashboard counters
+LIVE_DATA_STEP = 'live_data'
+SSE_HEARTBEAT_SECONDS = 15
+
+# Threads serving requests; each open progress stream holds one
+SERVER_THREADS = 16
+
+# Browsers may reuse the demo page for this long before revalidating its ETag
+DEMO_PAGE_MAX_AGE = 3600
+
+@functools.lru_cache(maxsize=None)
+def _shared_agent(agent_class, **kwargs):
+    """Construct each agent once per process; agents only hold configuration"""
+    return agent_class(**kwargs)
 
 class WebWorkflowOrchestrator:
     """Web-based workflow orchestrator with real-time updates"""
     
     def __init__(self, session_id: str):
         self.session_id = session_id
-        self.progress_queue = queue.Queue()
+        self.progress_queue = deque(maxlen=MAX_QUEUED_UPDATES)
+        self.progress_lock = threading.Lock()
+        self.progress_event = threading.Event()
+        # Queued live-data frame not yet delivered; newer counters are merged into it
+        self.live_frame = None
         self.workflow_data = {}
+        self.step_started = {}
+        self.future = None
+        self.generated_files = []
         
-        # Initialize agents
-        self.excel_parser = ExcelParserAgent(debug=False, enable_llm=False)
-        self.supplier_mapper = SupplierMappingAgent()
-        self.communicator = CommunicationAgent()
-        self.response_parser = ResponseParserAgent()
-        self.quote_calculator = QuoteCalculatorAgent()
-        self.document_generator = DocumentGeneratorAgent()
+        # Agents are shared across sessions
+        self.excel_parser = _shared_agent(ExcelParserAgent, debug=False, enable_llm=False)
+        self.supplier_mapper = _shared_agent(SupplierMappingAgent)
+        self.communicator = _shared_agent(CommunicationAgent)
+        self.response_parser = _shared_agent(ResponseParserAgent)
+        self.quote_calculator = _shared_agent(QuoteCalculatorAgent)
+        self.document_generator = _shared_agent(DocumentGeneratorAgent)
     
     def send_progress(self, step: str, status: str, data: dict = None):
         """Send progress update to frontend"""
+        data = data or {}
+        
+        # Time each step from its 'running' update to its 'completed' update
+        if status == 'running':
+            self.step_started[step] = time.perf_counter()
+        elif status == 'completed' and step in self.step_started:
+            data['duration_ms'] = (time.perf_counter() - self.step_started.pop(step)) * 1000
+        
         update = {
             'step': step,
             'status': status,
-            'timestamp': datetime.now().isoformat(),
-            'data': data or {}
+            'timestamp': datetime.now(),
+            'data': data
         }
-        self.progress_queue.put(update)
+        
+        with self.progress_lock:
+            pending = self.progress_queue
+            # Undelivered 'progress' updates for the same step are superseded
+            if (status == 'progress' and pending
+                    and pending[-1]['step'] == step and pending[-1]['status'] == 'progress'):
+                pending[-1] = update
+            else:
+                pending.append(update)
+        self.progress_event.set()
+    
+    def publish_live_data(self, **state):
+        """Merge dashboard counters into one queued live-data frame, moved to the latest position"""
+        with self.progress_lock:
+            pending = self.progress_queue
+            previous = self.live_frame
+            if previous is not None:
+                # The previous frame may already have been pushed out by maxlen
+                try:
+                    pending.remove(previous)
+                except ValueError:
+                    pass
+                state = {**previous['data'], **state}
+            frame = {
+                'step': LIVE_DATA_STEP,
+                'status': 'progress',
+                'timestamp': datetime.now(),
+                'data': state
+            }
+            if len(pending) == pending.maxlen:
+                pending.popleft()
+            # Never after a final step, where the stream stops reading
+            if pending and pending[-1]['step'] in FINAL_STEPS:
+                pending.insert(len(pending) - 1, frame)
+            else:
+                pending.append(frame)
+            self.live_frame = frame
+        self.progress_event.set()
+    
+    def drain_progress(self):
+        """Pop every queued progress update in arrival order"""
+        with self.progress_lock:
+            updates = list(self.progress_queue)
+            self.progress_queue.clear()
+            self.live_frame = None
+        return updates
     
     def run_demo_workflow(self, use_mock_data: bool = True):
         """Run the complete workflow with real-time updates"""
+        workflow_start = time.perf_counter()
         try:
             self.send_progress('start', 'running', {
                 'message': 'Starting construction workflow demo...',
@@ -71,23 +224,22 @@ class WebWorkflowOrchestrator:
             })
             
             if use_mock_data:
-                # Create demo Excel file
-                demo_file = create_test_excel()
-                parsed_items = self.excel_parser.parse_excel(demo_file)
+                # Demo Excel file is created and parsed once per process
+                items_data = _load_demo_items(self.excel_parser)
             else:
                 # Use existing test file
                 parsed_items = self.excel_parser.parse_excel("tests/input/realistic_test_v1.xlsx")
+                items_data = items_to_dicts(parsed_items)
             
-            items_data = [item.to_dict() for item in parsed_items]
-            
-            # Simulate processing time for visual effect
-            time.sleep(2)
-            
+            self.publish_live_data(items_count=len(items_data))
             self.send_progress('excel_parsing', 'completed', {
-                'message': f'Successfully parsed {len(parsed_items)} construction items',
-                'items_count': len(parsed_items),
+                'message': f'Successfully parsed {len(items_data)} construction items',
                 'categories': len(set(item.get('category', 'unknown') for item in items_data)),
-                'items_preview': items_data[:3]  # First 3 items for preview
+                # First 3 items for preview, without the heavyweight fields
+                'items_preview': [
+                    {'position': item.get('position_number'), 'description': item.get('description')}
+                    for item in items_data[:3]
+                ]
             })
             
             # Step 2: Supplier Mapping
@@ -96,19 +248,17 @@ class WebWorkflowOrchestrator:
                 'step_number': 2
             })
             
-            time.sleep(1.5)
             supplier_mappings = self.supplier_mapper.map_suppliers(items_data)
             
-            # Extract supplier info for display
-            unique_suppliers = set()
-            for mappings in supplier_mappings.values():
-                for match in mappings:
-                    unique_suppliers.add(match.supplier.name)
+            # Extract supplier info for display, in first-seen order
+            suppliers_list = list(dict.fromkeys(
+                map(attrgetter('supplier.name'), chain.from_iterable(supplier_mappings.values()))
+            ))
             
+            self.publish_live_data(suppliers_count=len(suppliers_list))
             self.send_progress('supplier_mapping', 'completed', {
-                'message': f'Mapped items to {len(unique_suppliers)} specialized suppliers',
-                'suppliers_count': len(unique_suppliers),
-                'suppliers_list': list(unique_suppliers),
+                'message': f'Mapped items to {len(suppliers_list)} specialized suppliers',
+                'suppliers_list': suppliers_list,
                 'mappings_count': len(supplier_mappings)
             })
             
@@ -120,17 +270,13 @@ class WebWorkflowOrchestrator:
             
             communication_requests = self._create_communication_requests(items_data, supplier_mappings)
             
-            # Simulate sending emails with progress
-            for i, request in enumerate(communication_requests):
-                time.sleep(1)
-                self.send_progress('communication', 'progress', {
-                    'message': f'Sending request to {request.supplier_name}...',
-                    'progress': (i + 1) / len(communication_requests) * 100,
-                    'current_supplier': request.supplier_name
-                })
+            self.send_progress('communication', 'progress', {
+                'message': f'Sending requests to {len(communication_requests)} suppliers...',
+                'suppliers': [request.supplier_name for request in communication_requests]
+            })
             
             communication_results = self.communicator.send_requests(communication_requests)
-            successful_requests = sum(1 for r in communication_results if r.success)
+            successful_requests = sum(map(attrgetter('success'), communication_results))
             
             self.send_progress('communication', 'completed', {
                 'message': f'Successfully sent {successful_requests} requests. Waiting for responses...',
@@ -145,10 +291,10 @@ class WebWorkflowOrchestrator:
                 'step_number': 4
             })
             
-            time.sleep(2)
             demo_responses = self._create_demo_responses(items_data, supplier_mappings)
             
-            total_offers = sum(len(r.get('items', [])) for r in demo_responses)
+            # Every demo response carries an 'items' list
+            total_offers = sum(map(len, map(itemgetter('items'), demo_responses)))
             
             self.send_progress('response_processing', 'completed', {
                 'message': f'Processed {len(demo_responses)} responses with {total_offers} price offers',
@@ -163,15 +309,16 @@ class WebWorkflowOrchestrator:
                 'step_number': 5
             })
             
-            time.sleep(1.5)
             quote_calculation = self.quote_calculator.calculate_quote(
                 items_data, demo_responses, f"QUOTE_WEB_{self.session_id}"
             )
             
+            self.publish_live_data(
+                quote_total=quote_calculation.final_total,
+                items_count=len(quote_calculation.items)
+            )
             self.send_progress('quote_calculation', 'completed', {
                 'message': f'Quote calculated: {quote_calculation.final_total:,.2f} RSD',
-                'quote_total': quote_calculation.final_total,
-                'items_count': len(quote_calculation.items),
                 'suppliers_used': len(quote_calculation.supplier_breakdown),
                 'margin_added': quote_calculation.margin_total,
                 'tax_included': quote_calculation.tax_total
@@ -183,8 +330,6 @@ class WebWorkflowOrchestrator:
                 'step_number': 6
             })
             
-            time.sleep(1)
-            
             # Prepare quote data for document generation
             quote_data = {
                 'quote_id': quote_calculation.quote_id,
@@ -197,33 +342,23 @@ class WebWorkflowOrchestrator:
                 },
                 'supplier_breakdown': quote_calculation.supplier_breakdown,
                 'items': [
-                    {
-                        'position': item.position,
-                        'description': item.description,
-                        'quantity': item.quantity,
-                        'unit': item.unit,
-                        'best_unit_price': item.best_unit_price,
-                        'margin_percentage': item.margin_percentage,
-                        'final_unit_price': item.final_unit_price,
-                        'final_total_price': item.final_total_price,
-                        'selected_supplier': item.selected_supplier
-                    }
-                    for item in quote_calculation.items
+                    dict(zip(QUOTE_ITEM_FIELDS, values))
+                    for values in map(_quote_item_values, quote_calculation.items)
                 ]
             }
             
-            output_folder = Path("web_demo_output")
-            generated_files = self.document_generator.generate_documents(quote_data, str(output_folder))
+            generated_files = self.document_generator.generate_documents(quote_data, str(WEB_OUTPUT_DIR))
+            self.generated_files = generated_files
             
+            self.publish_live_data(files_count=len(generated_files))
             self.send_progress('document_generation', 'completed', {
                 'message': f'Generated {len(generated_files)} professional documents',
-                'files_count': len(generated_files),
                 'files_list': [Path(f).name for f in generated_files],
                 'download_ready': True
             })
             
             # Final completion
-            total_time = time.time() - (time.time() - 15)  # Approximate total time
+            total_time = time.perf_counter() - workflow_start
             self.send_progress('workflow_complete', 'completed', {
                 'message': 'Construction workflow completed successfully!',
                 'total_time': f"{total_time:.1f} seconds",
@@ -241,71 +376,127 @@ class WebWorkflowOrchestrator:
     
     def _create_communication_requests(self, items, mappings):
         """Create communication requests for suppliers"""
-        requests = []
-        supplier_items = {}
+        supplier_items = defaultdict(list)
+        suppliers = {}
         
         for item in items:
-            position = item.get('position_number', 'unknown')
-            if position in mappings:
-                matches = mappings[position]
-                if matches:
-                    best_match = matches[0]
-                    supplier = best_match.supplier
-                    
-                    if supplier.name not in supplier_items:
-                        supplier_items[supplier.name] = {
-                            'supplier': supplier,
-                            'items': []
-                        }
-                    
-                    supplier_items[supplier.name]['items'].append(item)
-        
-        for supplier_name, data in supplier_items.items():
-            request = CommunicationRequest(
+            matches = mappings.get(item.get('position_number', 'unknown'))
+            if matches:
+                supplier = matches[0].supplier
+                supplier_items[supplier.name].append(item)
+                suppliers.setdefault(supplier.name, supplier)
+        
+        session_id = self.session_id
+        return [
+            CommunicationRequest(
                 supplier_name=supplier_name,
-                supplier_email=data['supplier'].contact_email,
-                items=data['items'],
-                request_id=f"REQ_WEB_{self.session_id}_{supplier_name.replace(' ', '_')}"
+                supplier_email=suppliers[supplier_name].contact_email,
+                items=supplier_item_list,
+                request_id=f"REQ_WEB_{session_id}_{supplier_name.replace(' ', '_')}"
             )
-            requests.append(request)
-        
-        return requests
+            for supplier_name, supplier_item_list in supplier_items.items()
+        ]
     
     def _create_demo_responses(self, items, mappings):
         """Create demo supplier responses"""
-        responses = []
-        suppliers = ['HVAC Sistem doo', 'Elektro Montaža', 'Izolacija Plus']
+        # Parsed items carry explicit None for unknown prices/quantities
+        item_keys = tuple(
+            (
+                item.get('position_number'),
+                item.get('description'),
+                _value_or(item.get('unit_price'), 100),
+                _value_or(item.get('quantity'), 1),
+                item.get('unit')
+            )
+            for item in items[:DEMO_RESPONSE_ITEM_COUNT]
+        )
         
-        for i, supplier in enumerate(suppliers):
-            response_items = []
-            
-            for item in items[:2]:  # Each supplier responds to first 2 items
-                base_price = item.get('unit_price', 100)
-                price_factor = 0.9 + (i * 0.1)  # 0.9, 1.0, 1.1
-                
-                response_items.append({
-                    'position': item.get('position_number'),
-                    'description': item.get('description'),
-                    'unit_price': base_price * price_factor,
-                    'quantity': item.get('quantity', 1),
-                    'total_price': base_price * price_factor * item.get('quantity', 1),
-                    'unit': item.get('unit'),
-                    'confidence': 0.9
-                })
-            
-            responses.append({
+        return [
+            {
                 'supplier_name': supplier,
                 'request_id': f"REQ_WEB_{self.session_id}_{supplier.replace(' ', '_')}",
                 'response_type': 'email',
-                'items': response_items
-            })
-        
-        return responses
+                'items': [dict(item) for item in response_items]
+            }
+            for supplier, response_items in zip(DEMO_RESPONSE_SUPPLIERS, _price_demo_items(item_keys))
+        ]
+
+def _load_demo_items(excel_parser):
+    """Create and parse the demo Excel file once; return fresh item dicts"""
+    global _demo_items_cache
+    with _demo_items_lock:
+        if _demo_items_cache is None:
+            demo_file = create_test_excel()
+            _demo_items_cache = tuple(items_to_dicts(excel_parser.parse_excel(demo_file)))
+    return [dict(item) for item in _demo_items_cache]
+
+def _value_or(value, default):
+    """Return value, or default when it is None"""
+    return default if value is None else value
+
+def _price_kernel(base_prices, quantities, factors):
+    """Unit and total prices for every (price factor, item) pair"""
+    unit_prices = [[base_price * factor for base_price in base_prices] for factor in factors]
+    total_prices = [
+        [unit_price * quantity for unit_price, quantity in zip(row, quantities)]
+        for row in unit_prices
+    ]
+    return unit_prices, total_prices
+
+@functools.lru_cache(maxsize=64)
+def _price_demo_items(item_keys):
+    """Price the demo items once per supplier factor; cached per item set"""
+    positions, descriptions, base_prices, quantities, units = zip(*item_keys) if item_keys else ((),) * 5
+    unit_prices, total_prices = _price_kernel(base_prices, quantities, DEMO_PRICE_FACTORS)
+    
+    return tuple(
+        tuple(
+            {
+                'position': position,
+                'description': description,
+                'unit_price': unit_price,
+                'quantity': quantity,
+                'total_price': total_price,
+                'unit': unit,
+                'confidence': 0.9
+            }
+            for position, description, unit_price, quantity, total_price, unit in zip(
+                positions, descriptions, supplier_unit_prices, quantities, supplier_total_prices, units
+            )
+        )
+        for supplier_unit_prices, supplier_total_prices in zip(unit_prices, total_prices)
+    )
+
+@functools.lru_cache(maxsize=1)
+def _demo_page():
+    """Load and precompress demo.html once; it has no template variables, so it is served as bytes"""
+    raw = (Path(app.root_path) / app.template_folder / 'demo.html').read_bytes()
+    # Preferred encoding first
+    encoded = {}
+    if brotli is not None:
+        encoded['br'] = brotli.compress(raw, quality=11)
+    encoded['gzip'] = gzip.compress(raw, 9)
+    return raw, encoded, hashlib.md5(raw).hexdigest()
 
 @app.route('/')
 def index():
     """Main demo page"""
-    return render_template('demo.html')
+    raw, encoded, etag = _demo_page()
+    
+    accepted = request.accept_encodings
+    for encoding, body in encoded.items():
+        if encoding in accepted:
+            response = Response(body, mimetype='text/html')
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = Response(raw, mimetype='text/html')
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.cache_control.public = True
+    response.cache_control.max_age = DEMO_PAGE_MAX_AGE
+    # Weak: the raw and compressed bodies are equivalent but not byte-identical
+    response.set_etag(etag, weak=True)
+    return response.make_conditional(request)
 
 @app.route('/start_demo', methods=['POST'])
 def start_demo():
@@ -314,16 +505,16 @@ def start_demo():
     
     # Create workflow orchestrator
     orchestrator = WebWorkflowOrchestrator(session_id)
-    demo_sessions[session_id] = orchestrator
-    progress_queues[session_id] = orchestrator.progress_queue
+    demo_sessions.add(session_id, orchestrator)
     
-    # Start workflow in background thread
+    # Start workflow on the shared worker pool
     def run_workflow():
-        orchestrator.run_demo_workflow(use_mock_data=True)
+        try:
+            orchestrator.run_demo_workflow(use_mock_data=True)
+        finally:
+            demo_sessions.discard_later(session_id, FINISHED_SESSION_GRACE_SECONDS)
     
-    thread = threading.Thread(target=run_workflow)
-    thread.daemon = True
-    thread.start()
+    orchestrator.future = WORKFLOW_POOL.submit(run_workflow)
     
     return jsonify({
         'session_id': session_id,
@@ -331,55 +522,135 @@ def start_demo():
         'message': 'Demo workflow started'
     })
 
+@app.route('/cancel_demo/<session_id>', methods=['POST'])
+def cancel_demo(session_id):
+    """Cancel a demo workflow that has not started running yet"""
+    orchestrator = demo_sessions.get(session_id)
+    if orchestrator is None:
+        return jsonify({'error': 'Session not found'}), 404
+    
+    if not orchestrator.future.cancel():
+        return jsonify({'session_id': session_id, 'status': 'running', 'message': 'Workflow already started'}), 409
+    
+    orchestrator.send_progress('error', 'failed', {'message': 'Workflow cancelled', 'error': 'cancelled'})
+    demo_sessions.discard_later(session_id, FINISHED_SESSION_GRACE_SECONDS)
+    return jsonify({'session_id': session_id, 'status': 'cancelled', 'message': 'Demo workflow cancelled'})
+
 @app.route('/get_progress/<session_id>')
 def get_progress(session_id):
     """Get real-time progress updates"""
-    if session_id not in progress_queues:
+    orchestrator = demo_sessions.get(session_id)
+    if orchestrator is None:
         return jsonify({'error': 'Session not found'}), 404
     
-    updates = []
-    progress_queue = progress_queues[session_id]
+    return jsonify({'updates': orchestrator.drain_progress()})
+
+@app.route('/stream/<session_id>')
+def stream_progress(session_id):
+    """Stream progress updates as Server-Sent Events"""
+    orchestrator = demo_sessions.get(session_id)
+    if orchestrator is None:
+        return jsonify({'error': 'Session not found'}), 404
     
-    # Get all available updates
-    try:
+    progress_event = orchestrator.progress_event
+    
+    def generate():
         while True:
-            update = progress_queue.get_nowait()
-            updates.append(update)
-    except queue.Empty:
-        pass
+            for update in orchestrator.drain_progress():
+                yield f"data: {app.json.dumps(update)}\n\n"
+                if update['step'] in FINAL_STEPS:
+                    return
+            
+            if not progress_event.wait(timeout=SSE_HEARTBEAT_SECONDS):
+                # Comment line keeps proxies from closing an idle connection
+                yield ": heartbeat\n\n"
+            # Clear before draining so updates queued meanwhile re-set the event
+            progress_event.clear()
     
-    return jsonify({'updates': updates})
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
 
 @app.route('/download_files/<session_id>')
 def download_files(session_id):
     """Download generated files"""
-    output_folder = Path("web_demo_output")
-    files = list(output_folder.glob("*.xlsx"))
-    
-    if files:
-        # Return the first Excel file for demo
-        return send_file(files[0], as_attachment=True)
-    else:
+    file_path = _find_download(session_id)
+    if file_path is None:
         return jsonify({'error': 'No files available'}), 404
+    
+    if DOWNLOAD_ACCEL_PREFIX:
+        file_name = os.path.basename(file_path)
+        return Response(headers={
+            'X-Accel-Redirect': DOWNLOAD_ACCEL_PREFIX.rstrip('/') + '/' + file_name,
+            'Content-Disposition': f'attachment; filename="{file_name}"'
+        })
+    
+    return send_file(os.path.abspath(file_path), as_attachment=True)
+
+def _find_download(session_id):
+    """Pick the session's first Excel document, else any Excel file in the output folder"""
+    orchestrator = demo_sessions.get(session_id)
+    if orchestrator is not None:
+        for file_path in orchestrator.generated_files:
+            if file_path.endswith('.xlsx'):
+                return file_path
+    
+    try:
+        with os.scandir(WEB_OUTPUT_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith('.xlsx') and entry.is_file():
+                    return entry.path
+    except FileNotFoundError:
+        pass
+    return None
+
+# System info never changes at runtime, so it is encoded once
+SYSTEM_INFO_BYTES = app.json.dumps({
+    'system_name': 'Construction Industry Agents',
+    'version': '1.0.0',
+    'description': 'AI-powered construction specification processing',
+    'features': [
+        'Excel parsing and analysis',
+        'Intelligent supplier mapping',
+        'Automated communication',
+        'Price optimization',
+        'Professional document generation'
+    ],
+    'time_savings': '95% (2-5 days → 30 minutes)',
+    'accuracy': '99%+',
+    'supported_languages': ['Serbian', 'English']
+}).encode('utf-8')
+SYSTEM_INFO_ETAG = hashlib.md5(SYSTEM_INFO_BYTES).hexdigest()
 
 @app.route('/api/system_info')
 def system_info():
     """Get system information"""
-    return jsonify({
-        'system_name': 'Construction Industry Agents',
-        'version': '1.0.0',
-        'description': 'AI-powered construction specification processing',
-        'features': [
-            'Excel parsing and analysis',
-            'Intelligent supplier mapping',
-            'Automated communication',
-            'Price optimization',
-            'Professional document generation'
-        ],
-        'time_savings': '95% (2-5 days → 30 minutes)',
-        'accuracy': '99%+',
-        'supported_languages': ['Serbian', 'English']
-    })
+    response = Response(
+        SYSTEM_INFO_BYTES,
+        mimetype='application/json',
+        headers={'Cache-Control': 'public, max-age=3600'}
+    )
+    response.set_etag(SYSTEM_INFO_ETAG)
+    # Answers 304 Not Modified when the client's If-None-Match matches
+    return response.make_conditional(request)
+
+def create_app():
+    """Return the configured Flask application"""
+    return app
+
+def run_server(host: str = '0.0.0.0', port: int = 5000):
+    """Serve the app with waitress when installed, else Flask's threaded server"""
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host=host, port=port, debug=False, threaded=True)
+    else:
+        serve(app, host=host, port=port, threads=SERVER_THREADS)
 
 if __name__ == '__main__':
     # Create templates directory and HTML file
@@ -729,7 +1000,7 @@ if __name__ == '__main__':
 
     <script>
         let currentSessionId = null;
-        let progressInterval = null;
+        let progressSource = null;
         let currentStep = 0;
         
         const stepMapping = {
@@ -741,11 +1012,137 @@ if __name__ == '__main__':
             'document_generation': 'step-documents'
         };
         
+        // The script runs after the markup, so node references are taken once up front
+        const nodes = {
+            startBtn: document.getElementById('startBtn'),
+            progressPanel: document.getElementById('progressPanel'),
+            progressFill: document.getElementById('progressFill'),
+            statusMessage: document.getElementById('statusMessage'),
+            liveData: document.getElementById('liveData'),
+            downloadSection: document.getElementById('downloadSection'),
+            logsPanel: document.getElementById('logsPanel'),
+            logEntries: document.getElementById('logEntries')
+        };
+        // [step, element] pairs resolved once; handlers never touch stepMapping or the DOM tree
+        const stepEntries = Object.entries(stepMapping).map(([step, stepId]) => [step, document.getElementById(stepId)]);
+        const stepByKey = new Map(stepEntries);
+        // Card title -> value element, filled as cards are created
+        const cardRefs = new Map();
+        // Card title -> DOM id slug
+        const slugCache = new Map();
+        
+        function cardSlug(title) {
+            let slug = slugCache.get(title);
+            if (!slug) {
+                slug = title.replace(/\\s+/g, '-').toLowerCase();
+                slugCache.set(title, slug);
+            }
+            return slug;
+        }
+        
+        // Progress snapshot kept in IndexedDB so a reload can rehydrate instead of restarting
+        const SNAPSHOT_KEY = 'last';
+        const SNAPSHOT_MAX_LOGS = 200;
+        let snapshot = null;
+        let snapshotFrame = null;
+        let snapshotDb = null;
+        
+        function openSnapshotDb() {
+            if (!snapshotDb) {
+                snapshotDb = new Promise((resolve, reject) => {
+                    if (!window.indexedDB) {
+                        reject(new Error('IndexedDB unavailable'));
+                        return;
+                    }
+                    const openRequest = indexedDB.open('demo', 1);
+                    openRequest.onupgradeneeded = () => openRequest.result.createObjectStore('sessions', { keyPath: 'id' });
+                    openRequest.onsuccess = () => resolve(openRequest.result);
+                    openRequest.onerror = () => reject(openRequest.error);
+                });
+            }
+            return snapshotDb;
+        }
+        
+        async function snapshotStore(mode) {
+            const db = await openSnapshotDb();
+            return db.transaction('sessions', mode).objectStore('sessions');
+        }
+        
+        function newSnapshot(sessionId) {
+            return { id: SNAPSHOT_KEY, sessionId, steps: {}, cards: {}, logs: [], progress: 0, status: '', complete: false, downloadable: false };
+        }
+        
+        function scheduleSnapshot() {
+            if (snapshot && !snapshotFrame) {
+                snapshotFrame = requestAnimationFrame(writeSnapshot);
+            }
+        }
+        
+        async function writeSnapshot() {
+            snapshotFrame = null;
+            if (!snapshot) return;
+            try {
+                (await snapshotStore('readwrite')).put(snapshot);
+            } catch (error) {
+                console.warn('Progress snapshot not saved:', error);
+            }
+        }
+        
+        async function loadSnapshot() {
+            try {
+                const store = await snapshotStore('readonly');
+                return await new Promise((resolve, reject) => {
+                    const getRequest = store.get(SNAPSHOT_KEY);
+                    getRequest.onsuccess = () => resolve(getRequest.result || null);
+                    getRequest.onerror = () => reject(getRequest.error);
+                });
+            } catch (error) {
+                console.warn('Progress snapshot not loaded:', error);
+                return null;
+            }
+        }
+        
+        async function clearSnapshot() {
+            snapshot = null;
+            try {
+                (await snapshotStore('readwrite')).delete(SNAPSHOT_KEY);
+            } catch (error) {
+                console.warn('Progress snapshot not cleared:', error);
+            }
+        }
+        
+        function restoreSnapshot(saved) {
+            const { startBtn, progressPanel, liveData, logsPanel, progressFill, statusMessage } = nodes;
+            
+            progressPanel.style.display = 'block';
+            liveData.style.display = 'block';
+            logsPanel.style.display = 'block';
+            
+            Object.entries(saved.steps).forEach(([step, status]) => updateWorkflowStep(step, status));
+            Object.entries(saved.cards).forEach(([title, { value, icon }]) => updateDataCard(title, value, icon));
+            saved.logs.forEach(message => addLogEntry(message));
+            progressFill.style.width = saved.progress + '%';
+            statusMessage.textContent = saved.status;
+            
+            currentSessionId = saved.sessionId;
+            snapshot = saved;
+            
+            if (saved.complete) {
+                startBtn.disabled = false;
+                startBtn.textContent = '🔄 Run Demo Again';
+                if (saved.downloadable) {
+                    nodes.downloadSection.style.display = 'block';
+                }
+            } else {
+                startBtn.disabled = true;
+                startBtn.textContent = '🔄 Resuming Demo...';
+                // Undelivered updates are still queued server-side for this session
+                openProgressStream(saved.sessionId);
+            }
+        }
+        
         async function startDemo() {
-            const startBtn = document.getElementById('startBtn');
-            const progressPanel = document.getElementById('progressPanel');
-            const liveData = document.getElementById('liveData');
-            const logsPanel = document.getElementById('logsPanel');
+            const { startBtn, progressPanel, liveData, logsPanel } = nodes;
             
             startBtn.disabled = true;
             startBtn.textContent = '🔄 Starting Demo...';
@@ -762,9 +1159,10 @@ if __name__ == '__main__':
                 
                 const data = await response.json();
                 currentSessionId = data.session_id;
+                snapshot = newSnapshot(currentSessionId);
                 
-                // Start polling for progress
-                progressInterval = setInterval(checkProgress, 1000);
+                // Subscribe to pushed progress updates
+                openProgressStream(currentSessionId);
                 
                 addLogEntry(`🚀 Demo started with session ID: ${currentSessionId}`);
                 
@@ -775,32 +1173,57 @@ if __name__ == '__main__':
             }
         }
         
-        async function checkProgress() {
-            if (!currentSessionId) return;
+        function openProgressStream(sessionId) {
+            closeProgressStream();
+            progressSource = new EventSource(`/stream/${sessionId}`);
             
-            try {
-                const response = await fetch(`/get_progress/${currentSessionId}`);
-                const data = await response.json();
+            progressSource.onmessage = event => {
+                const update = JSON.parse(event.data);
+                processUpdate(update);
                 
-                if (data.updates && data.updates.length > 0) {
-                    data.updates.forEach(update => {
-                        processUpdate(update);
-                    });
+                if (update.step === 'workflow_complete' || update.step === 'error') {
+                    if (snapshot) {
+                        snapshot.complete = true;
+                        scheduleSnapshot();
+                    }
+                    closeProgressStream();
                 }
-                
-            } catch (error) {
-                console.error('Error checking progress:', error);
+            };
+            
+            progressSource.onerror = error => {
+                console.error('Progress stream error:', error);
+                // A closed source was refused outright, e.g. the session expired
+                if (progressSource && progressSource.readyState === EventSource.CLOSED) {
+                    addLogEntry('⚠️ Session is no longer available');
+                    clearSnapshot();
+                    resetDemo();
+                }
+            };
+        }
+        
+        function closeProgressStream() {
+            if (progressSource) {
+                progressSource.close();
+                progressSource = null;
             }
         }
         
         function processUpdate(update) {
             const { step, status, data } = update;
             
+            // Merged dashboard counters: only the cards change
+            if (step === 'live_data') {
+                updateLiveData(data);
+                return;
+            }
+            
             addLogEntry(`[${new Date().toLocaleTimeString()}] ${data.message || update.step}`);
             
             // Update status message
-            const statusMessage = document.getElementById('statusMessage');
-            statusMessage.textContent = data.message || `Processing ${step}...`;
+            nodes.statusMessage.textContent = data.message || `Processing ${step}...`;
+            if (snapshot) {
+                snapshot.status = nodes.statusMessage.textContent;
+            }
             
             // Update workflow diagram
             updateWorkflowStep(step, status);
@@ -808,7 +1231,10 @@ if __name__ == '__main__':
             // Update progress bar
             if (data.step_number) {
                 const progress = (data.step_number / 6) * 100;
-                document.getElementById('progressFill').style.width = progress + '%';
+                nodes.progressFill.style.width = progress + '%';
+                if (snapshot) {
+                    snapshot.progress = progress;
+                }
             }
             
             // Update live data
@@ -821,16 +1247,17 @@ if __name__ == '__main__':
         }
         
         function updateWorkflowStep(step, status) {
-            const stepId = stepMapping[step];
-            if (stepId) {
-                const stepElement = document.getElementById(stepId);
+            const stepElement = stepByKey.get(step);
+            if (stepElement) {
                 stepElement.className = 'workflow-step ' + status;
+                if (snapshot) {
+                    snapshot.steps[step] = status;
+                    scheduleSnapshot();
+                }
             }
         }
         
         function updateLiveData(data) {
-            const liveDataContainer = document.getElementById('liveData');
-            
             if (data.items_count !== undefined) {
                 updateDataCard('Items Processed', data.items_count, '📊');
             }
@@ -845,43 +1272,71 @@ if __name__ == '__main__':
             }
         }
         
+        // Card updates are queued and applied together once per animation frame
+        const pendingCards = new Map();
+        let cardsFrameScheduled = false;
+        
         function updateDataCard(title, value, icon) {
-            const liveDataContainer = document.getElementById('liveData');
-            
-            let card = document.getElementById(`card-${title.replace(/\\s+/g, '-').toLowerCase()}`);
-            if (!card) {
-                card = document.createElement('div');
-                card.className = 'data-card';
-                card.id = `card-${title.replace(/\\s+/g, '-').toLowerCase()}`;
-                card.innerHTML = `
+            pendingCards.set(title, { value, icon });
+            if (snapshot) {
+                snapshot.cards[title] = { value, icon };
+                scheduleSnapshot();
+            }
+            if (!cardsFrameScheduled) {
+                cardsFrameScheduled = true;
+                requestAnimationFrame(flushCards);
+            }
+        }
+        
+        function flushCards() {
+            const newCards = document.createDocumentFragment();
+            const valueUpdates = [];
+            
+            // Look up or build every card first, then write all values
+            pendingCards.forEach(({ value, icon }, title) => {
+                let valueElement = cardRefs.get(title);
+                if (!valueElement) {
+                    const card = document.createElement('div');
+                    card.className = 'data-card';
+                    card.id = `card-${cardSlug(title)}`;
+                    card.innerHTML = `
                     <h3>${icon} ${title}</h3>
-                    <div class="data-value" id="value-${title.replace(/\\s+/g, '-').toLowerCase()}">-</div>
+                    <div class="data-value">-</div>
                 `;
-                liveDataContainer.appendChild(card);
-            }
+                    newCards.appendChild(card);
+                    valueElement = card.querySelector('.data-value');
+                    cardRefs.set(title, valueElement);
+                }
+                valueUpdates.push([valueElement, value]);
+            });
+            
+            nodes.liveData.appendChild(newCards);
+            valueUpdates.forEach(([valueElement, value]) => {
+                valueElement.textContent = value;
+            });
             
-            const valueElement = document.getElementById(`value-${title.replace(/\\s+/g, '-').toLowerCase()}`);
-            valueElement.textContent = value;
+            pendingCards.clear();
+            cardsFrameScheduled = false;
         }
         
         function handleWorkflowComplete(data) {
-            const startBtn = document.getElementById('startBtn');
-            const downloadSection = document.getElementById('downloadSection');
-            const progressFill = document.getElementById('progressFill');
+            const { startBtn, downloadSection, progressFill } = nodes;
             
             progressFill.style.width = '100%';
             startBtn.textContent = '✅ Demo Completed!';
+            if (snapshot) {
+                snapshot.progress = 100;
+                snapshot.complete = true;
+                snapshot.downloadable = true;
+            }
             downloadSection.style.display = 'block';
             
             addLogEntry(`🎉 Workflow completed in ${data.total_time}!`);
             addLogEntry(`💰 Final quote: ${data.final_total} RSD`);
             addLogEntry(`📄 ${data.files_generated} documents generated`);
             
-            // Stop polling
-            if (progressInterval) {
-                clearInterval(progressInterval);
-                progressInterval = null;
-            }
+            // Stop listening for updates
+            closeProgressStream();
             
             // Enable restart after 3 seconds
             setTimeout(() => {
@@ -891,34 +1346,53 @@ if __name__ == '__main__':
             }, 3000);
         }
         
+        // Log lines are buffered and appended once per animation frame
+        const logBuffer = [];
+        let logFrame = null;
+        
         function addLogEntry(message) {
-            const logEntries = document.getElementById('logEntries');
-            const entry = document.createElement('div');
-            entry.className = 'log-entry';
-            entry.textContent = message;
-            logEntries.appendChild(entry);
+            logBuffer.push(message);
+            if (snapshot) {
+                snapshot.logs.push(message);
+                if (snapshot.logs.length > SNAPSHOT_MAX_LOGS) {
+                    snapshot.logs.splice(0, snapshot.logs.length - SNAPSHOT_MAX_LOGS);
+                }
+                scheduleSnapshot();
+            }
+            if (!logFrame) {
+                logFrame = requestAnimationFrame(flushLogs);
+            }
+        }
+        
+        function flushLogs() {
+            const entries = document.createDocumentFragment();
+            logBuffer.forEach(message => {
+                const entry = document.createElement('div');
+                entry.className = 'log-entry';
+                entry.textContent = message;
+                entries.appendChild(entry);
+            });
+            nodes.logEntries.appendChild(entries);
+            
+            // Auto-scroll to bottom, once for the whole batch
+            nodes.logsPanel.scrollTop = nodes.logsPanel.scrollHeight;
             
-            // Auto-scroll to bottom
-            const logsPanel = document.getElementById('logsPanel');
-            logsPanel.scrollTop = logsPanel.scrollHeight;
+            logBuffer.length = 0;
+            logFrame = null;
         }
         
         function resetWorkflowSteps() {
-            Object.values(stepMapping).forEach(stepId => {
-                const stepElement = document.getElementById(stepId);
+            for (const [, stepElement] of stepEntries) {
                 stepElement.className = 'workflow-step';
-            });
+            }
         }
         
         function resetDemo() {
-            const startBtn = document.getElementById('startBtn');
+            const startBtn = nodes.startBtn;
             startBtn.disabled = false;
             startBtn.textContent = '🚀 Start Live Demo';
             
-            if (progressInterval) {
-                clearInterval(progressInterval);
-                progressInterval = null;
-            }
+            closeProgressStream();
             
             currentSessionId = null;
             resetWorkflowSteps();
@@ -936,8 +1410,13 @@ if __name__ == '__main__':
             }
         }
         
-        // Load system info on page load
+        // Rehydrate the last demo from its snapshot, then load system info
         window.addEventListener('load', async () => {
+            const saved = await loadSnapshot();
+            if (saved) {
+                restoreSnapshot(saved);
+            }
+            
             try {
                 const response = await fetch('/api/system_info');
                 const systemInfo = await response.json();
@@ -955,7 +1434,7 @@ if __name__ == '__main__':
         f.write(html_content)
     
     # Create output directories
-    Path('web_demo_output').mkdir(exist_ok=True)
+    WEB_OUTPUT_DIR.mkdir(exist_ok=True)
     
     print("🌐 Starting Construction Industry Agents Web Frontend...")
     print("📊 Demo will be available at: http://localhost:5000")
@@ -968,4 +1447,4 @@ if __name__ == '__main__':
     print()
     print("🚀 Starting server...")
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    run_server(host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -14,7 +14,7 @@ import threading
 from datetime import datetime
 
 # Import all the agents
-from src.domains.parsing.agents.excel_parser_agent import ExcelParserAgent
+from src.domains.parsing.agents.excel_parser_agent import ExcelParserAgent, items_to_dicts
 from src.domains.suppliers.agents.supplier_mapping_agent import SupplierMappingAgent
 from src.domains.communication.agents.communication_agent import CommunicationAgent, CommunicationRequest
 from src.domains.responses.agents.response_parser_agent import ResponseParserAgent
@@ -159,7 +159,7 @@ class VisualWorkflowMonitor:
             step_start = time.time()
             
             parsed_items = self.excel_parser.parse_excel(excel_file_path)
-            items_data = [item.to_dict() for item in parsed_items]
+            items_data = items_to_dicts(parsed_items)
             
             step_duration = time.time() - step_start
             self.update_step(0, "completed", f"Parsed {len(parsed_items)} items", step_duration)
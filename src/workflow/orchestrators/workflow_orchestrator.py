@@ -4,21 +4,44 @@ Workflow Orchestrator for Construction Industry Agents
 Runs the complete end-to-end workflow as defined in the system architecture
 """
 
+import atexit
+import io
 import json
 import logging
+import queue
 import time
+from collections import defaultdict, deque
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import chain
+from logging.handlers import QueueHandler, QueueListener
+from operator import attrgetter
 from pathlib import Path
 from typing import Dict, List, Optional
 import sys
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is used instead
+    orjson = None
+
 # Import all the agents
-from src.domains.parsing.agents.excel_parser_agent import ExcelParserAgent
+from src.domains.parsing.agents.excel_parser_agent import ExcelParserAgent, items_to_dicts
 from src.domains.suppliers.agents.supplier_mapping_agent import SupplierMappingAgent
 from src.domains.communication.agents.communication_agent import CommunicationAgent, CommunicationRequest
 from src.domains.responses.agents.response_parser_agent import ResponseParserAgent
 from src.domains.quotes.agents.quote_calculator_agent import QuoteCalculatorAgent
 from src.domains.documents.agents.document_generator_agent import DocumentGeneratorAgent
 
+# Upper bound on suppliers contacted concurrently
+MAX_COMMUNICATION_WORKERS = 16
+
+# Upper bound on unconsumed step events kept per workflow
+MAX_PROGRESS_EVENTS = 256
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,6 +49,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Started by main() only, so importing the module leaves logging to the host app
+_log_listener = None
+
+def _start_log_listener():
+    """Move the root handlers behind a queue so formatting and stream writes never block the steps"""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    root = logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    _log_listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+# QuoteItem fields passed on to document generation
+QUOTE_ITEM_FIELDS = (
+    'position', 'description', 'quantity', 'unit', 'best_unit_price',
+    'margin_percentage', 'final_unit_price', 'final_total_price', 'selected_supplier'
+)
+_quote_item_values = attrgetter(*QUOTE_ITEM_FIELDS)
+
+def _quote_item_row(item) -> Dict:
+    """Document row for a single QuoteItem"""
+    return dict(zip(QUOTE_ITEM_FIELDS, _quote_item_values(item)))
+
+class _QuoteItemRows(Sequence):
+    """Read-only view of QuoteItems as document rows, built on access instead of copied up front"""
+    
+    __slots__ = ('_items',)
+    
+    def __init__(self, items):
+        self._items = items
+    
+    def __len__(self):
+        return len(self._items)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [_quote_item_row(item) for item in self._items[index]]
+        return _quote_item_row(self._items[index])
+    
+    def __iter__(self):
+        return map(_quote_item_row, self._items)
+
 class WorkflowOrchestrator:
     """Orchestrates the complete construction industry workflow"""
     
@@ -48,13 +116,37 @@ class WorkflowOrchestrator:
         # Workflow state
         self.workflow_id = f"WORKFLOW_{int(time.time())}"
         self.workflow_data = {}
+        # Step events for live consumers such as an SSE endpoint
+        self.progress_queue = deque(maxlen=MAX_PROGRESS_EVENTS)
+        # Step name -> duration in seconds, filled by _timed
+        self._durations = {}
+    
+    @contextmanager
+    def _timed(self, key: str):
+        """Record the duration of the enclosed block under key"""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._durations[key] = (time.perf_counter_ns() - start) / 1e9
+    
+    def _emit(self, step: str, status: str, message: str, **data):
+        """Record a step transition for live consumers and log it"""
+        self.progress_queue.append({
+            'step': step,
+            'status': status,
+            'timestamp': time.time(),
+            'data': {'message': message, **data}
+        })
+        logger.info(message)
         
     def run_complete_workflow(self, excel_file_path: str, output_folder: str = "workflow_output") -> Dict:
         """Run the complete workflow from Excel file to final documents"""
         logger.info(f"🚀 Starting complete workflow: {self.workflow_id}")
         logger.info(f"📁 Input file: {excel_file_path}")
         
-        workflow_start_time = time.time()
+        workflow_start_ns = time.perf_counter_ns()
+        durations = self._durations
         
         try:
             # Create output folder
@@ -62,93 +154,91 @@ class WorkflowOrchestrator:
             output_path.mkdir(parents=True, exist_ok=True)
             
             # Step 1: Parse Excel file
-            logger.info("📊 STEP 1: Parsing Excel file...")
-            step1_start = time.time()
-            parsed_items = self.excel_parser.parse_excel(excel_file_path)
-            step1_duration = time.time() - step1_start
+            self._emit('excel_parsing', 'running', "📊 STEP 1: Parsing Excel file...")
+            with self._timed('excel_parsing'):
+                parsed_items = self.excel_parser.parse_excel(excel_file_path)
+            step1_duration = durations['excel_parsing']
             
             if not parsed_items:
                 raise Exception("No items parsed from Excel file")
             
-            logger.info(f"✅ Parsed {len(parsed_items)} items in {step1_duration:.1f}s")
+            self._emit('excel_parsing', 'completed', f"✅ Parsed {len(parsed_items)} items in {step1_duration:.1f}s",
+                       items_count=len(parsed_items), duration=step1_duration)
             
             # Convert to dictionary format for other agents
-            items_data = [item.to_dict() for item in parsed_items]
+            items_data = items_to_dicts(parsed_items)
             
             # Step 2: Map suppliers
-            logger.info("🏭 STEP 2: Mapping suppliers...")
-            step2_start = time.time()
-            supplier_mappings = self.supplier_mapper.map_suppliers(items_data)
-            step2_duration = time.time() - step2_start
+            self._emit('supplier_mapping', 'running', "🏭 STEP 2: Mapping suppliers...")
+            with self._timed('supplier_mapping'):
+                supplier_mappings = self.supplier_mapper.map_suppliers(items_data)
+            step2_duration = durations['supplier_mapping']
             
-            logger.info(f"✅ Mapped suppliers for {len(supplier_mappings)} items in {step2_duration:.1f}s")
+            self._emit('supplier_mapping', 'completed',
+                       f"✅ Mapped suppliers for {len(supplier_mappings)} items in {step2_duration:.1f}s",
+                       mappings_count=len(supplier_mappings), duration=step2_duration)
             
             # Step 3: Send communication requests
-            logger.info("📤 STEP 3: Sending supplier requests...")
-            step3_start = time.time()
-            communication_requests = self._create_communication_requests(items_data, supplier_mappings)
-            communication_results = self.communicator.send_requests(communication_requests)
-            step3_duration = time.time() - step3_start
+            self._emit('communication', 'running', "📤 STEP 3: Sending supplier requests...")
+            with self._timed('communication'):
+                communication_requests = self._create_communication_requests(items_data, supplier_mappings)
+                communication_results = self._send_requests_concurrently(communication_requests)
+            step3_duration = durations['communication']
             
-            logger.info(f"✅ Sent {len(communication_requests)} requests in {step3_duration:.1f}s")
+            self._emit('communication', 'completed', f"✅ Sent {len(communication_requests)} requests in {step3_duration:.1f}s",
+                       requests_sent=len(communication_requests), duration=step3_duration)
             
             # Step 4: Parse responses (simulate for demo)
-            logger.info("📥 STEP 4: Parsing supplier responses...")
-            step4_start = time.time()
-            demo_responses = self._create_demo_responses(items_data, supplier_mappings)
-            parsed_responses = demo_responses  # In real implementation, would parse actual responses
-            step4_duration = time.time() - step4_start
+            self._emit('response_processing', 'running', "📥 STEP 4: Parsing supplier responses...")
+            with self._timed('response_parsing'):
+                demo_responses = self._create_demo_responses(items_data, supplier_mappings)
+                parsed_responses = demo_responses  # In real implementation, would parse actual responses
+            step4_duration = durations['response_parsing']
             
-            logger.info(f"✅ Parsed {len(parsed_responses)} responses in {step4_duration:.1f}s")
+            self._emit('response_processing', 'completed',
+                       f"✅ Parsed {len(parsed_responses)} responses in {step4_duration:.1f}s",
+                       responses_count=len(parsed_responses), duration=step4_duration)
             
             # Step 5: Calculate quote
-            logger.info("🧮 STEP 5: Calculating optimal quote...")
-            step5_start = time.time()
-            quote_calculation = self.quote_calculator.calculate_quote(
-                items_data, 
-                parsed_responses,
-                f"QUOTE_{self.workflow_id}"
-            )
-            step5_duration = time.time() - step5_start
+            self._emit('quote_calculation', 'running', "🧮 STEP 5: Calculating optimal quote...")
+            with self._timed('quote_calculation'):
+                quote_calculation = self.quote_calculator.calculate_quote(
+                    items_data, 
+                    parsed_responses,
+                    f"QUOTE_{self.workflow_id}"
+                )
+            step5_duration = durations['quote_calculation']
             
-            logger.info(f"✅ Quote calculated: {quote_calculation.final_total:,.2f} RSD in {step5_duration:.1f}s")
+            self._emit('quote_calculation', 'completed',
+                       f"✅ Quote calculated: {quote_calculation.final_total:,.2f} RSD in {step5_duration:.1f}s",
+                       quote_total=quote_calculation.final_total, duration=step5_duration)
             
             # Step 6: Generate documents
-            logger.info("📄 STEP 6: Generating final documents...")
-            step6_start = time.time()
-            quote_data = {
-                'quote_id': quote_calculation.quote_id,
-                'calculation_timestamp': quote_calculation.calculation_timestamp,
-                'summary': {
-                    'subtotal': quote_calculation.subtotal,
-                    'margin_total': quote_calculation.margin_total,
-                    'tax_total': quote_calculation.tax_total,
-                    'final_total': quote_calculation.final_total
-                },
-                'supplier_breakdown': quote_calculation.supplier_breakdown,
-                'items': [
-                    {
-                        'position': item.position,
-                        'description': item.description,
-                        'quantity': item.quantity,
-                        'unit': item.unit,
-                        'best_unit_price': item.best_unit_price,
-                        'margin_percentage': item.margin_percentage,
-                        'final_unit_price': item.final_unit_price,
-                        'final_total_price': item.final_total_price,
-                        'selected_supplier': item.selected_supplier
-                    }
-                    for item in quote_calculation.items
-                ]
-            }
-            
-            generated_files = self.document_generator.generate_documents(quote_data, str(output_path))
-            step6_duration = time.time() - step6_start
+            self._emit('document_generation', 'running', "📄 STEP 6: Generating final documents...")
+            with self._timed('document_generation'):
+                quote_data = {
+                    'quote_id': quote_calculation.quote_id,
+                    'calculation_timestamp': quote_calculation.calculation_timestamp,
+                    'summary': {
+                        'subtotal': quote_calculation.subtotal,
+                        'margin_total': quote_calculation.margin_total,
+                        'tax_total': quote_calculation.tax_total,
+                        'final_total': quote_calculation.final_total
+                    },
+                    'supplier_breakdown': quote_calculation.supplier_breakdown,
+                    # Rows are built per pass, so no second copy of every item is held
+                    'items': _QuoteItemRows(quote_calculation.items)
+                }
+                
+                generated_files = self.document_generator.generate_documents(quote_data, str(output_path))
+            step6_duration = durations['document_generation']
             
-            logger.info(f"✅ Generated {len(generated_files)} documents in {step6_duration:.1f}s")
+            self._emit('document_generation', 'completed',
+                       f"✅ Generated {len(generated_files)} documents in {step6_duration:.1f}s",
+                       files_count=len(generated_files), duration=step6_duration)
             
             # Workflow summary
-            total_duration = time.time() - workflow_start_time
+            total_duration = (time.perf_counter_ns() - workflow_start_ns) / 1e9
             
             workflow_result = {
                 'workflow_id': self.workflow_id,
@@ -175,127 +265,164 @@ class WorkflowOrchestrator:
             
             # Save workflow result
             result_file = output_path / f"workflow_result_{self.workflow_id}.json"
-            with open(result_file, 'w', encoding='utf-8') as f:
-                json.dump(workflow_result, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                result_file.write_bytes(
+                    orjson.dumps(workflow_result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                )
+            else:
+                with open(result_file, 'w', encoding='utf-8') as f:
+                    json.dump(workflow_result, f, indent=2, ensure_ascii=False)
             
+            # Live consumers render the final quote from this event instead of re-fetching
+            self._emit('workflow_complete', 'completed',
+                       f"🎉 Workflow completed in {total_duration:.1f}s",
+                       final_quote=workflow_result['final_quote'],
+                       generated_files=generated_files,
+                       total_duration=total_duration)
             self._print_workflow_summary(workflow_result)
             
             return workflow_result
             
         except Exception as e:
+            self.progress_queue.append({
+                'step': 'error',
+                'status': 'failed',
+                'timestamp': time.time(),
+                'data': {'message': f'Workflow failed: {str(e)}', 'error': str(e)}
+            })
             logger.error(f"❌ Workflow failed: {str(e)}")
             raise Exception(f"Workflow failed: {str(e)}")
     
+    def _send_requests_concurrently(self, requests: List[CommunicationRequest]) -> List:
+        """Send requests in parallel, one batch per mail domain; results keep request order"""
+        if not requests:
+            return []
+        
+        # Requests to the same domain run back to back on one worker and share its connection
+        batches = self.communicator.group_by_domain(requests)
+        with ThreadPoolExecutor(max_workers=min(MAX_COMMUNICATION_WORKERS, len(batches))) as executor:
+            batch_results = list(executor.map(self.communicator.send_batch, batches.values()))
+        
+        results_by_id = {result.request_id: result for result in chain.from_iterable(batch_results)}
+        return [results_by_id[request.request_id] for request in requests]
+    
     def _create_communication_requests(self, items: List[Dict], mappings: Dict) -> List[CommunicationRequest]:
         """Create communication requests for suppliers"""
-        requests = []
-        supplier_items = {}
+        supplier_items = defaultdict(list)
+        suppliers = {}
         
-        # Group items by supplier
+        # Group items by their best-matching supplier
         for item in items:
-            position = item.get('position_number', 'unknown')
-            if position in mappings:
-                matches = mappings[position]
-                if matches:
-                    best_match = matches[0]  # Take the best match
-                    supplier = best_match.supplier
-                    
-                    if supplier.name not in supplier_items:
-                        supplier_items[supplier.name] = {
-                            'supplier': supplier,
-                            'items': []
-                        }
-                    
-                    supplier_items[supplier.name]['items'].append(item)
+            matches = mappings.get(item.get('position_number', 'unknown'))
+            if matches:
+                supplier = matches[0].supplier
+                supplier_items[supplier.name].append(item)
+                suppliers.setdefault(supplier.name, supplier)
         
         # Create requests for each supplier
-        for supplier_name, data in supplier_items.items():
-            request = CommunicationRequest(
+        workflow_id = self.workflow_id
+        return [
+            CommunicationRequest(
                 supplier_name=supplier_name,
-                supplier_email=data['supplier'].contact_email,
-                items=data['items'],
-                request_id=f"REQ_{self.workflow_id}_{supplier_name.replace(' ', '_')}"
+                supplier_email=suppliers[supplier_name].contact_email,
+                items=supplier_item_list,
+                request_id=f"REQ_{workflow_id}_{supplier_name.replace(' ', '_')}"
             )
-            requests.append(request)
-        
-        return requests
+            for supplier_name, supplier_item_list in supplier_items.items()
+        ]
     
     def _create_demo_responses(self, items: List[Dict], mappings: Dict) -> List[Dict]:
         """Create demo supplier responses for testing"""
-        responses = []
-        
         # Create responses from different suppliers with varying prices
         suppliers = ['HVAC Sistem doo', 'Elektro Montaža', 'Izolacija Plus']
+        demo_items = items[:2]  # Each supplier responds to first 2 items
         
-        for i, supplier in enumerate(suppliers):
-            response_items = []
-            
-            for item in items[:2]:  # Each supplier responds to first 2 items
-                base_price = item.get('unit_price', 100)
-                # Add price variation: 0.9x to 1.1x of original
-                price_factor = 0.9 + (i * 0.1)  # 0.9, 1.0, 1.1
-                
-                response_items.append({
-                    'position': item.get('position_number'),
-                    'description': item.get('description'),
-                    'unit_price': base_price * price_factor,
-                    'quantity': item.get('quantity', 1),
-                    'total_price': base_price * price_factor * item.get('quantity', 1),
-                    'unit': item.get('unit'),
-                    'confidence': 0.9
-                })
-            
-            responses.append({
+        # Unknown prices/quantities arrive as explicit None
+        base_prices = np.array(
+            [100 if item.get('unit_price') is None else item['unit_price'] for item in demo_items], dtype=float
+        )
+        quantities = np.array(
+            [1 if item.get('quantity') is None else item['quantity'] for item in demo_items], dtype=float
+        )
+        
+        # Add price variation: 0.9x to 1.1x of original, one row per supplier
+        price_factors = 0.9 + np.arange(len(suppliers)) * 0.1
+        unit_prices = price_factors[:, None] * base_prices[None, :]
+        total_prices = unit_prices * quantities[None, :]
+        
+        return [
+            {
                 'supplier_name': supplier,
                 'request_id': f"REQ_{self.workflow_id}_{supplier.replace(' ', '_')}",
                 'response_type': 'email',
-                'items': response_items
-            })
-        
-        return responses
+                'items': [
+                    {
+                        'position': item.get('position_number'),
+                        'description': item.get('description'),
+                        'unit_price': unit_price,
+                        'quantity': item.get('quantity', 1),
+                        'total_price': total_price,
+                        'unit': item.get('unit'),
+                        'confidence': 0.9
+                    }
+                    for item, unit_price, total_price in zip(demo_items, supplier_unit_prices, supplier_total_prices)
+                ]
+            }
+            for supplier, supplier_unit_prices, supplier_total_prices in zip(
+                suppliers, unit_prices.tolist(), total_prices.tolist()
+            )
+        ]
     
     def _print_workflow_summary(self, result: Dict):
         """Print a comprehensive workflow summary"""
-        print("\n" + "="*80)
-        print("🎉 KONSTRUKCIJSKI PROJEKAT - WORKFLOW ZAVRŠEN!")
-        print("="*80)
+        # Build the summary first and write it once; per-line prints stall callers sharing stdout
+        buf = io.StringIO()
+        write = buf.write
+        steps = result['steps']
+        quote = result['final_quote']
         
-        print(f"\n📊 WORKFLOW PREGLED:")
-        print(f"  • Workflow ID: {result['workflow_id']}")
-        print(f"  • Ukupno vreme: {result['total_duration']:.1f} sekundi")
-        print(f"  • Status: {'✅ USPEŠNO' if result['success'] else '❌ NEUSPEŠNO'}")
+        write("\n" + "="*80 + "\n")
+        write("🎉 KONSTRUKCIJSKI PROJEKAT - WORKFLOW ZAVRŠEN!\n")
+        write("="*80 + "\n")
         
-        print(f"\n⏱️  DETALJAN PREGLED KORAKA:")
-        steps = result['steps']
-        print(f"  1. 📊 Excel parsing: {steps['excel_parsing']['duration']:.1f}s ({steps['excel_parsing']['items_parsed']} stavki)")
-        print(f"  2. 🏭 Supplier mapping: {steps['supplier_mapping']['duration']:.1f}s ({steps['supplier_mapping']['mappings_created']} mapiranja)")
-        print(f"  3. 📤 Communication: {steps['communication']['duration']:.1f}s ({steps['communication']['requests_sent']} zahteva)")
-        print(f"  4. 📥 Response parsing: {steps['response_parsing']['duration']:.1f}s ({steps['response_parsing']['responses_parsed']} odgovora)")
-        print(f"  5. 🧮 Quote calculation: {steps['quote_calculation']['duration']:.1f}s (ukupno: {steps['quote_calculation']['quote_total']:,.2f} RSD)")
-        print(f"  6. 📄 Document generation: {steps['document_generation']['duration']:.1f}s ({steps['document_generation']['files_generated']} fajlova)")
+        write(f"\n📊 WORKFLOW PREGLED:\n")
+        write(f"  • Workflow ID: {result['workflow_id']}\n")
+        write(f"  • Ukupno vreme: {result['total_duration']:.1f} sekundi\n")
+        write(f"  • Status: {'✅ USPEŠNO' if result['success'] else '❌ NEUSPEŠNO'}\n")
         
-        quote = result['final_quote']
-        print(f"\n💰 FINALNA PONUDA:")
-        print(f"  • Broj ponude: {quote['quote_id']}")
-        print(f"  • Ukupno stavki: {quote['total_items']}")
-        print(f"  • Broj dobavljača: {quote['suppliers_count']}")
-        print(f"  • FINALNA CENA: {quote['final_total']:,.2f} RSD")
+        write(f"\n⏱️  DETALJAN PREGLED KORAKA:\n")
+        write(f"  1. 📊 Excel parsing: {steps['excel_parsing']['duration']:.1f}s ({steps['excel_parsing']['items_parsed']} stavki)\n")
+        write(f"  2. 🏭 Supplier mapping: {steps['supplier_mapping']['duration']:.1f}s ({steps['supplier_mapping']['mappings_created']} mapiranja)\n")
+        write(f"  3. 📤 Communication: {steps['communication']['duration']:.1f}s ({steps['communication']['requests_sent']} zahteva)\n")
+        write(f"  4. 📥 Response parsing: {steps['response_parsing']['duration']:.1f}s ({steps['response_parsing']['responses_parsed']} odgovora)\n")
+        write(f"  5. 🧮 Quote calculation: {steps['quote_calculation']['duration']:.1f}s (ukupno: {steps['quote_calculation']['quote_total']:,.2f} RSD)\n")
+        write(f"  6. 📄 Document generation: {steps['document_generation']['duration']:.1f}s ({steps['document_generation']['files_generated']} fajlova)\n")
+        
+        write(f"\n💰 FINALNA PONUDA:\n")
+        write(f"  • Broj ponude: {quote['quote_id']}\n")
+        write(f"  • Ukupno stavki: {quote['total_items']}\n")
+        write(f"  • Broj dobavljača: {quote['suppliers_count']}\n")
+        write(f"  • FINALNA CENA: {quote['final_total']:,.2f} RSD\n")
         
-        print(f"\n📁 GENERISANI DOKUMENTI:")
+        write(f"\n📁 GENERISANI DOKUMENTI:\n")
         for file_path in result['generated_files']:
-            print(f"  📄 {file_path}")
+            write(f"  📄 {file_path}\n")
+        
+        write(f"\n🚀 REZULTAT:\n")
+        write(f"  ✅ Sistem je uspešno obradio projekat za {result['total_duration']:.1f} sekundi!\n")
+        write(f"  🎯 Umesto 2-5 dana, ponuda je gotova za {result['total_duration']/60:.1f} minuta!\n")
+        write(f"  💡 Automatizacija je 95%+ brža od manuelnog procesa!\n")
         
-        print(f"\n🚀 REZULTAT:")
-        print(f"  ✅ Sistem je uspešno obradio projekat za {result['total_duration']:.1f} sekundi!")
-        print(f"  🎯 Umesto 2-5 dana, ponuda je gotova za {result['total_duration']/60:.1f} minuta!")
-        print(f"  💡 Automatizacija je 95%+ brža od manuelnog procesa!")
+        write("="*80 + "\n")
         
-        print("="*80)
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
 
 def main():
     """Main function to test the complete workflow"""
     print("🏗️ Construction Industry Workflow Orchestrator")
     print("=" * 60)
+    _start_log_listener()
     
     # Check command line arguments
     enable_llm = '--enable-llm' in sys.argv